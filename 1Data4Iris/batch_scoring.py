@@ -0,0 +1,102 @@
+#Imports
+
+import time
+import numpy as np
+import pandas as pd
+
+# Features used by iris_classification_pipeline (in training order)
+FEATURES = ['sepal_length', 'sepal_width', 'petal_length', 'petal_width']
+CHUNK_SIZE = 50_000
+
+# Words of measurement column names (English and Polish, like in 25__iris.csv) - column belongs to feature
+# when its name contains one word of each group
+FEATURE_WORDS = {
+    'sepal_length': (('sepal', 'kielich'), ('length', 'długoś', 'dlugos')),
+    'sepal_width': (('sepal', 'kielich'), ('width', 'szerokoś', 'szerokos')),
+    'petal_length': (('petal', 'płat', 'plat'), ('length', 'długoś', 'dlugos')),
+    'petal_width': (('petal', 'płat', 'plat'), ('width', 'szerokoś', 'szerokos')),
+}
+MAX_REPORTED_ROWS = 20
+
+def _matches(column, feature):
+    name = str(column).lower()
+    return all(any(word in name for word in words) for words in FEATURE_WORDS[feature])
+
+# Function to map file header to model features - every feature needs exactly one column matched by name,
+# otherwise file is rejected (ValueError) before anything is scored
+def resolve_columns(columns):
+    mapping = {}
+    for feature in FEATURES:
+        found = [column for column in columns if _matches(column, feature)]
+        if not found:
+            raise ValueError(f"No column for {feature} in file header ({', '.join(map(str, columns))}).")
+        if len(found) > 1:
+            raise ValueError(f"Column for {feature} is ambiguous: {', '.join(map(str, found))}.")
+        mapping[feature] = found[0]
+    if len(set(mapping.values())) < len(FEATURES):
+        raise ValueError(f"One column matches several features: {mapping}.")
+    return mapping
+
+# Function to read CSV / Parquet measurements chunk by chunk as float arrays (column mapping resolved once
+# from header; non-numeric values become NaN, score_chunks reports those rows)
+def iter_measurement_chunks(source, filename=None, chunk_size=CHUNK_SIZE):
+    filename = filename or getattr(source, 'name', str(source))
+    if filename.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(source)
+        mapping = resolve_columns(parquet_file.schema_arrow.names)
+        frames = (batch.to_pandas() for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=list(mapping.values())))
+    else:
+        mapping = resolve_columns(list(pd.read_csv(source, nrows=0).columns))
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        frames = pd.read_csv(source, chunksize=chunk_size, usecols=list(mapping.values()), dtype=str)
+    for frame in frames:
+        values = frame[[mapping[feature] for feature in FEATURES]].apply(pd.to_numeric, errors='coerce')
+        yield values.to_numpy(dtype=np.float64)
+
+# Function to score one chunk straight through the pipeline (no predict_model overhead,
+# pipeline already decodes labels with its label_encoding step)
+def predict_labels(pipeline, X):
+    frame = pd.DataFrame(X, columns=FEATURES, copy=False)
+    return np.asarray(pipeline.predict(frame))
+
+# Function to classify one set of measurements from the form (dict with FEATURES) - one-row table with label
+def classify_measurements(pipeline, input_data):
+    input_df = pd.DataFrame([input_data])
+    input_df['prediction_label'] = predict_labels(pipeline, input_df[FEATURES].to_numpy(dtype=float))
+    return input_df
+
+# Function to score chunks lazily - yields results and running throughput; rows with missing or
+# non-numeric measurements get no label and are counted in bad_rows (first row numbers in bad_row_numbers)
+def score_chunks(pipeline, chunks):
+    rows = 0
+    bad_rows = 0
+    bad_row_numbers = []
+    started = time.perf_counter()
+    for X in chunks:
+        result = pd.DataFrame(X, columns=FEATURES)
+        valid = ~np.isnan(X).any(axis=1)
+        labels = np.full(len(X), None, dtype=object)
+        if valid.any():
+            labels[valid] = predict_labels(pipeline, X[valid])
+        result['prediction_label'] = labels
+        if not valid.all():
+            bad_rows += int((~valid).sum())
+            missing = MAX_REPORTED_ROWS - len(bad_row_numbers)
+            # 1-based data row numbers (header not counted)
+            bad_row_numbers += (np.flatnonzero(~valid)[:missing] + rows + 1).tolist()
+        rows += len(result)
+        elapsed = time.perf_counter() - started
+        stats = {'rows': rows, 'bad_rows': bad_rows, 'bad_row_numbers': bad_row_numbers, 'seconds': elapsed,
+                 'rows_per_sec': rows / elapsed if elapsed else 0.0}
+        yield result, stats
+
+# Callable API - score whole file and write predictions to CSV
+def score_file(pipeline, source, output, filename=None, chunk_size=CHUNK_SIZE):
+    stats = {'rows': 0, 'bad_rows': 0, 'bad_row_numbers': [], 'seconds': 0.0, 'rows_per_sec': 0.0}
+    header = True
+    for result, stats in score_chunks(pipeline, iter_measurement_chunks(source, filename, chunk_size)):
+        result.to_csv(output, index=False, header=header)
+        header = False
+    return stats
@@ -0,0 +1,98 @@
+#Imports
+
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import seaborn as sns
+from matplotlib.figure import Figure
+
+# Rendered charts shared by all sessions: (stats content hash, chart spec, format) -> image bytes
+MAX_CHARTS = 256
+
+_cache = OrderedDict()
+_pending = {}
+_lock = threading.RLock()
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='chart-render')
+
+# Chart specs used by Data analysis tabs - (kind, columns...)
+def histogram_specs(columns):
+    return [('hist', col) for col in columns]
+
+def scatter_specs(pairs):
+    return [('scatter', x, y) for x, y in pairs]
+
+def boxplot_specs(columns):
+    return [('box', col) for col in columns]
+
+# Renderers - draw from StreamingStats summaries on plain Figure objects
+# (no pyplot global state), so they are safe to run in threads
+def _render_hist(fig, stats, col):
+    counts, edges = stats.histogram(col, bins=20)
+    ax = fig.subplots()
+    ax.hist(edges[:-1], bins=edges, weights=counts, color='skyblue', edgecolor='black')
+    ax.set_title(f'{col}')
+    ax.set_xlabel(f'{col} (cm)')
+    ax.set_ylabel('Frequency')
+
+def _render_scatter(fig, stats, x, y):
+    ax = fig.subplots()
+    sns.scatterplot(x=x, y=y, hue=stats.class_column, data=stats.sample, ax=ax)
+
+def _render_box(fig, stats, col):
+    ax = fig.subplots()
+    boxes = ax.bxp(stats.boxplot_stats(col), patch_artist=True, widths=0.8)
+    for patch, color in zip(boxes['boxes'], sns.color_palette('Set2')):
+        patch.set_facecolor(color)
+    ax.set_title(f'{col}', fontsize=20)
+    ax.set_xlabel('Class', fontsize=16)
+    ax.set_ylabel(f'{col} (cm)', fontsize=16)
+
+RENDERERS = {
+    'hist': (_render_hist, (8, 6)),
+    'scatter': (_render_scatter, (10, 6)),
+    'box': (_render_box, (18, 10)),
+}
+
+# Function to render one chart spec into image bytes
+def render_chart(stats, spec, fmt='png'):
+    renderer, figsize = RENDERERS[spec[0]]
+    fig = Figure(figsize=figsize)
+    renderer(fig, stats, *spec[1:])
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, bbox_inches='tight')
+    return buffer.getvalue()
+
+def _store(key, future):
+    with _lock:
+        _pending.pop(key, None)
+        if future.exception() is not None:
+            return
+        _cache[key] = future.result()
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CHARTS:
+            _cache.popitem(last=False)
+
+# Function to schedule rendering (one render per key, even with many sessions asking at once)
+def _submit(stats, spec, fmt):
+    key = (stats.content_hash, spec, fmt)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return None, _cache[key]
+        future = _pending.get(key)
+        if future is None:
+            future = _executor.submit(render_chart, stats, spec, fmt)
+            _pending[key] = future
+            future.add_done_callback(lambda done: _store(key, done))
+    return future, None
+
+# Function to get chart bytes from cache (renders on miss)
+def get_chart(stats, spec, fmt='png'):
+    future, image = _submit(stats, spec, fmt)
+    return image if future is None else future.result()
+
+# Function to warm cache in background - tabs user never opens are ready if they do
+def prerender(stats, specs, fmt='png'):
+    for spec in specs:
+        _submit(stats, spec, fmt)
@@ -0,0 +1,149 @@
+#Imports
+
+import hashlib
+import sys
+from pathlib import Path
+import numpy as np
+
+# Compiled iris predictor - fitted pycaret pipeline exported to plain arrays (imputer means, linear model
+# weights, class names), prediction needs only NumPy: no pycaret / sklearn import, no pickle
+MODEL_PATH = Path(__file__).with_name('iris_classification_pipeline.pkl')
+PREDICTOR_PATH = Path(__file__).with_name('iris_predictor.npz')
+DATA_PATH = Path(__file__).with_name('25__iris.csv')
+
+# Function to compute sha256 of file (pipeline the predictor was compiled from)
+def file_sha256(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+class CompiledPredictor:
+    # source_sha256 - sha256 of pipeline file it was compiled from ('' when unknown)
+    def __init__(self, features, fill_values, coef, intercept, classes, source_sha256=''):
+        self.features = [str(feature) for feature in features]
+        self.fill_values = np.asarray(fill_values, dtype=np.float64)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.classes = np.asarray(classes).astype(str)
+        self.source_sha256 = source_sha256
+
+    @classmethod
+    def load(cls, path=PREDICTOR_PATH):
+        with np.load(path, allow_pickle=False) as arrays:
+            source_sha256 = str(arrays['source_sha256']) if 'source_sha256' in arrays.files else ''
+            return cls(arrays['features'], arrays['fill_values'], arrays['coef'], arrays['intercept'], arrays['classes'],
+                       source_sha256)
+
+    def save(self, path=PREDICTOR_PATH):
+        np.savez(path, features=np.array(self.features), fill_values=self.fill_values, coef=self.coef,
+                 intercept=self.intercept, classes=self.classes, source_sha256=np.array(self.source_sha256))
+
+    # Function to compute decision values (same arithmetic as imputer + linear model in pipeline)
+    def decision_function(self, X):
+        if hasattr(X, 'columns'):
+            X = X[self.features]
+        X = np.asarray(X, dtype=np.float64)
+        X = np.where(np.isnan(X), self.fill_values, X)
+        return X @ self.coef.T + self.intercept
+
+    # Function to predict class names - works like pipeline.predict, for DataFrame or array
+    def predict(self, X):
+        scores = self.decision_function(X)
+        if scores.shape[1] == 1:
+            return self.classes[(scores[:, 0] > 0).astype(int)]
+        return self.classes[scores.argmax(axis=1)]
+
+# Function to compile fitted pycaret pipeline - supported steps: label encoding, simple imputers,
+# final linear model with coef_ / intercept_ (Logistic Regression, Ridge, LDA, linear SVM)
+def compile_pipeline(pipeline):
+    features = [name for name in pipeline.feature_names_in_ if name != pipeline.steps[0][1].target_name_]
+    fill_values = np.full(len(features), np.nan)
+    classes = None
+    for name, step in pipeline.steps[:-1]:
+        transformer = getattr(step, 'transformer', step)
+        kind = type(transformer).__name__
+        if kind == 'LabelEncoder':
+            classes = transformer.classes_
+        elif kind == 'SimpleImputer':
+            columns = list(step.include or [])
+            if not columns:
+                # imputer without columns (no categorical features) is not fitted and does nothing
+                continue
+            if transformer.strategy not in ('mean', 'median', 'constant'):
+                raise ValueError(f"Step {name}: imputer strategy {transformer.strategy!r} is not supported.")
+            for column, value in zip(columns, transformer.statistics_):
+                fill_values[features.index(column)] = value
+        else:
+            raise ValueError(f"Step {name} ({kind}) cannot be compiled.")
+
+    estimator = pipeline.steps[-1][1]
+    if not hasattr(estimator, 'coef_') or not hasattr(estimator, 'intercept_'):
+        raise ValueError(f"Model {type(estimator).__name__} is not linear, it cannot be compiled.")
+    labels = estimator.classes_ if classes is None else classes[estimator.classes_]
+    return CompiledPredictor(features, fill_values, estimator.coef_, estimator.intercept_, labels)
+
+# Function to check compiled predictor against pycaret predict_model - labels and decision values must be identical
+def verify(pipeline, predictor, data_path=DATA_PATH):
+    import pandas as pd
+    from pycaret.classification import predict_model
+
+    data = pd.read_csv(data_path)
+    data = data.iloc[:, :len(predictor.features)].set_axis(predictor.features, axis=1)
+    # extra rows with missing values - imputer path is checked too
+    rng = np.random.default_rng(123)
+    extra = pd.DataFrame(rng.uniform(0.1, 8.0, size=(1000, len(predictor.features))), columns=predictor.features)
+    extra = extra.mask(rng.random(extra.shape) < 0.2)
+    data = pd.concat([data, extra], ignore_index=True)
+
+    expected = predict_model(pipeline, data=data, verbose=False)['prediction_label'].to_numpy()
+    labels = predictor.predict(data)
+    expected_scores = pipeline.decision_function(data)
+    return {
+        'rows': len(data),
+        'labels_identical': bool(np.array_equal(labels.astype(str), expected.astype(str))),
+        'scores_identical': bool(np.array_equal(predictor.decision_function(data), expected_scores)),
+    }
+
+# Export: python compiled_predictor.py - compiles pipeline, verifies it, compares cold start in fresh interpreters
+if __name__ == '__main__':
+    import subprocess
+    import joblib
+
+    pipeline = joblib.load(MODEL_PATH)
+    predictor = compile_pipeline(pipeline)
+    predictor.source_sha256 = file_sha256(MODEL_PATH)
+    predictor.save()
+    print(f"Saved {PREDICTOR_PATH.name} ({PREDICTOR_PATH.stat().st_size} bytes)")
+    print(f"Verification: {verify(pipeline, predictor)}")
+    if '--no-benchmark' in sys.argv:
+        sys.exit()
+
+    model_dir = str(MODEL_PATH.parent)
+    row = "[[5.1, 3.5, 1.4, 0.2]]"
+    snippets = {
+        'pycaret load_model + predict_model': (
+            "import pandas as pd; from pycaret.classification import load_model, predict_model; "
+            f"model = load_model({str(MODEL_PATH.with_suffix(''))!r}, verbose=False); "
+            f"label = predict_model(model, data=pd.DataFrame({row}, columns=model.feature_names_in_[:4]), "
+            "verbose=False)['prediction_label'][0]"
+        ),
+        'model_registry (joblib pipeline)': (
+            f"import sys; sys.path.insert(0, {model_dir!r}); "
+            "import model_registry, batch_scoring; "
+            f"label = batch_scoring.predict_labels(model_registry.load_pipeline(), {row})[0]"
+        ),
+        'compiled predictor': (
+            f"import sys; sys.path.insert(0, {model_dir!r}); "
+            "from compiled_predictor import CompiledPredictor; "
+            f"label = CompiledPredictor.load().predict({row})[0]"
+        ),
+    }
+    for name, snippet in snippets.items():
+        # peak memory from VmHWM - ru_maxrss of child started from this (big) process would include ours
+        code = (
+            "import time; started = time.perf_counter(); "
+            f"{snippet}; "
+            "peak = [line.split()[1] for line in open('/proc/self/status') if line.startswith('VmHWM')][0]; "
+            "print(f'{label}: {time.perf_counter() - started:.2f} s to first prediction, {int(peak) / 1024:.0f} MB peak')"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        print(f"{name}: {result.stdout.strip().splitlines()[-1] if result.stdout.strip() else result.stderr[-500:]}")
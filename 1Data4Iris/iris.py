@@ -1,11 +1,33 @@
 import streamlit as st
 import pandas as pd
 import seaborn as sns
-import matplotlib.pyplot as plt
-from pycaret.classification import load_model, predict_model
 import base64
+import io
+import os
+import sys
+import uuid
+from pathlib import Path
+from chart_cache import boxplot_specs, get_chart, histogram_specs, prerender, scatter_specs
+from streaming_stats import stats_from_csv
+from batch_scoring import classify_measurements, iter_measurement_chunks, score_chunks
+from model_registry import INFERENCE_URL, load_predictor, predict_remote, preload
+
+# Rerun timings (instrumentation/timings.py, shared by all apps) - stages of every rerun go to JSON lines,
+# cProfile capture when "Profile reruns" is on for this session
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'instrumentation'))
+import timings
+
+if 'session_id' not in st.session_state:
+    st.session_state['session_id'] = uuid.uuid4().hex
+timings.begin('Data4Iris', st.session_state['session_id'], profile=st.session_state.get('profile_reruns', False))
+
+# Warm start - pipeline loads in background once per process, whichever mode user opens first
+# (not needed when classifications go to inference service)
+if not INFERENCE_URL:
+    preload()
 
 mode = st.sidebar.radio("Choose your mode", ['Introduction', 'Machine learning', 'Data analysis', 'Presentation'])
+st.sidebar.checkbox("Profile reruns 🔬", key='profile_reruns', help="cProfile of every rerun of this session (see instrumentation/dashboard.py)")
 
 if mode == 'Introduction':
     
@@ -27,22 +49,30 @@ if mode == 'Introduction':
 
 if mode == 'Machine learning':
      
-    MODEL_NAME = '1Data4Iris/iris_classification_pipeline'
-
-    @st.cache_data
+    # Shared resource - one model per process, no copy per session
+    # (compiled NumPy predictor when exported, pipeline otherwise)
+    @st.cache_resource
     def load_classification_model():
-        return load_model(MODEL_NAME)
-
-    model = load_classification_model()
+        return load_predictor()
 
+    # Classification in inference service when INFERENCE_URL is set, locally otherwise (or when service is down)
     def classify_iris(input_data):
         input_df = pd.DataFrame([input_data])
-        predictions = predict_model(model, data=input_df)
-        return predictions
+        if INFERENCE_URL:
+            try:
+                with timings.call('inference service'):
+                    input_df['prediction_label'] = predict_remote([input_data])
+                return input_df
+            except OSError as e:
+                st.caption(f"Inference service unavailable ({e}), classified locally.")
+        with timings.stage('load model'):
+            model = load_classification_model()
+        with timings.stage('classify'):
+            return classify_measurements(model, input_data)
 
     st.title("Machine learning 👓")
 
-    tab1, tab2, tab3, tab4 = st.tabs(["Introduction", "Values input", "Key feature", "Confusion Matrix"])
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Introduction", "Values input", "Key feature", "Confusion Matrix", "Batch scoring"])
 
     with tab1:
         st.header("Machine learning introduction 💡")
@@ -80,13 +110,79 @@ if mode == 'Machine learning':
 
         st.image('1Data4Iris/matrix.png', caption='Matrix')
 
+    with tab5:
+        st.title('Batch scoring 🚜')
+        st.write("Upload CSV or Parquet file with measurements (sepal length, sepal width, petal length, petal width).")
+        uploaded_file = st.file_uploader("Measurements file", type=['csv', 'parquet'])
+
+        if uploaded_file is not None and st.button("Classify file ⚔"):
+            output = io.StringIO()
+            progress = st.empty()
+            stats = None
+            with timings.stage('load model'):
+                model = load_classification_model()
+            try:
+                with timings.stage('batch scoring') as stage:
+                    for i, (result, stats) in enumerate(score_chunks(model, iter_measurement_chunks(uploaded_file, uploaded_file.name))):
+                        result.to_csv(output, index=False, header=(i == 0))
+                        progress.write(f"Scored **{stats['rows']:,}** rows ({stats['rows_per_sec']:,.0f} rows/sec)")
+                    stage['rows'] = stats['rows'] if stats is not None else 0
+            except ValueError as e:
+                # wrong / ambiguous header - nothing was scored
+                st.error(f"Error: {e}")
+                stats = None
+            else:
+                if stats is None:
+                    st.warning("File has no rows to score.")
+
+            if stats is not None:
+                st.success(f"Done: {stats['rows']:,} rows in {stats['seconds']:.2f} s ({stats['rows_per_sec']:,.0f} rows/sec)")
+                if stats['bad_rows']:
+                    rows = ', '.join(map(str, stats['bad_row_numbers']))
+                    st.warning(f"{stats['bad_rows']:,} rows have missing or non-numeric measurements and were not classified "
+                               f"(rows {rows}{', ...' if stats['bad_rows'] > len(stats['bad_row_numbers']) else ''}).")
+                st.download_button(
+                    label="Download predictions.csv",
+                    data=output.getvalue(),
+                    file_name="predictions.csv",
+                    mime="text/csv"
+                )
+
 if mode == 'Data analysis':
      
     st.title("Iris Analysis 📚")
 
-    # Data loading
-    df = pd.read_csv('1Data4Iris/25__iris.csv', sep=",")
-    df.columns = ('długość kielicha', 'szerokość kielicha', 'długość płatka', 'szerokość płatka', 'klasa')
+    # Data loading - one streaming pass per file version, only summaries stay in memory
+    # (only CSV files of data directory can be opened - IRIS_DATA_DIR, app folder by default)
+    data_dir = Path(os.environ.get('IRIS_DATA_DIR', Path(__file__).parent)).resolve()
+    data_files = sorted(path.name for path in data_dir.glob('*.csv'))
+    if not data_files:
+        st.error(f"Brak plików CSV w katalogu danych {data_dir}.")
+        st.stop()
+    data_file = st.sidebar.selectbox("Measurements file (CSV)", data_files,
+                                     index=data_files.index('25__iris.csv') if '25__iris.csv' in data_files else 0)
+    data_path = (data_dir / data_file).resolve()
+    column_names = ['długość kielicha', 'szerokość kielicha', 'długość płatka', 'szerokość płatka', 'klasa']
+
+    @st.cache_resource(max_entries=4)
+    def load_iris_stats(path, modified):
+        return stats_from_csv(path, column_names)
+
+    # symlinks in data directory may not lead outside it
+    if not data_path.is_relative_to(data_dir) or not data_path.is_file():
+        st.error(f"Plik {data_file} nie został znaleziony.")
+        st.stop()
+    with timings.stage('read CSV'):
+        stats = load_iris_stats(str(data_path), data_path.stat().st_mtime)
+
+    columns = ['długość płatka', 'szerokość płatka', 'długość kielicha', 'szerokość kielicha']
+    chart_specs = {
+        "Data Analysis": histogram_specs(columns),
+        "Correlations": scatter_specs([('szerokość kielicha', 'długość kielicha'), ('szerokość płatka', 'długość płatka')]),
+        "Boxplot": boxplot_specs(columns),
+    }
+    with timings.stage('prerender charts'):
+        prerender(stats, [spec for specs in chart_specs.values() for spec in specs])
         
     with st.expander("Analysis summary"):
                     st.write("""
@@ -97,46 +193,23 @@ if mode == 'Data analysis':
                         * Sepal length and width are generally larger than petal length and width.
                         * When comparing petal length and width, the data for each group is very diverse, and each group has unique values.""")
 
-    # Switching tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Data Overview", "Data Analysis", "Correlations", "Matrix", "Boxplot"])
+    # Switching tabs - only selected tab is rendered on rerun
+    tab = st.radio("Tab", ["Data Overview", "Data Analysis", "Correlations", "Matrix", "Boxplot"], horizontal=True, label_visibility="collapsed")
 
-    with tab1:
-        st.write(df.sample(10))
+    if tab == "Data Overview":
+        st.write(stats.sample.sample(min(10, len(stats.sample))))
 
-    with tab2:
-        columns = ['długość płatka', 'szerokość płatka', 'długość kielicha', 'szerokość kielicha']
-        for col in columns:
-            fig = plt.figure(figsize=(8, 6))
-            plt.hist(df[col], bins=20, color='skyblue', edgecolor='black')
-            plt.title(f'{col}')
-            plt.xlabel(f'{col} (cm)')
-            plt.ylabel('Frequency')
-            st.pyplot(fig)
-
-    with tab3:    
-        plt.figure(figsize=(10, 6))
-        scatter = sns.scatterplot(x='szerokość kielicha', y='długość kielicha', hue='klasa', data=df)
-        st.pyplot(plt.gcf())
-        
-        plt.figure(figsize=(10, 6))
-        scatter2 = sns.scatterplot(x='szerokość płatka', y='długość płatka', hue='klasa', data=df)
-        st.pyplot(plt.gcf())
+    if tab in chart_specs:
+        with timings.stage('plot charts', tab=tab):
+            for spec in chart_specs[tab]:
+                st.image(get_chart(stats, spec))
 
-    with tab4:
-        matrix = df[["długość kielicha", "szerokość kielicha", "długość płatka", "szerokość płatka"]].corr()
-        colormap = sns.light_palette("green", as_cmap=True)
-        matrix_colored = matrix.style.background_gradient(cmap=colormap)
-        st.dataframe(matrix_colored)
-
-    with tab5:
-        columns = ['długość płatka', 'szerokość płatka', 'długość kielicha', 'szerokość kielicha']
-        for col in columns:
-            fig, ax = plt.subplots(figsize=(18, 10))
-            sns.boxplot(data=df, x='klasa', y=col, ax=ax, palette='Set2')
-            ax.set_title(f'{col}', fontsize=20)
-            ax.set_xlabel('Class', fontsize=16)
-            ax.set_ylabel(f'{col} (cm)', fontsize=16)
-            st.pyplot(fig)
+    if tab == "Matrix":
+        with timings.stage('correlation matrix'):
+            matrix = stats.correlation()
+            colormap = sns.light_palette("green", as_cmap=True)
+            matrix_colored = matrix.style.background_gradient(cmap=colormap)
+            st.dataframe(matrix_colored)
 
 if mode == 'Presentation':
     
@@ -228,4 +301,5 @@ if mode == 'Presentation':
 
              
 
-
+# Rerun finished - timings written (st.stop / errors leave rerun open, next rerun writes it as incomplete)
+timings.end()
@@ -0,0 +1,113 @@
+#Imports
+
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+import joblib
+
+# Process-wide registry - every session shares one copy of the pipeline
+MODEL_PATH = Path(__file__).with_name('iris_classification_pipeline.pkl')
+PREDICTOR_PATH = Path(__file__).with_name('iris_predictor.npz')
+# Inference service (inference_service/server.py) - when set, single classifications go there
+INFERENCE_URL = os.environ.get('INFERENCE_URL')
+INFERENCE_TIMEOUT = float(os.environ.get('INFERENCE_TIMEOUT', 10))
+
+_lock = threading.Lock()
+_models = {}
+_stats = {}
+_preload_thread = None
+
+# Function to read peak memory of the process in MB (ru_maxrss is KB on Linux, bytes on macOS)
+def _peak_memory_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+# Function to load model once per process (stats: load time and memory used)
+def _load(key, loader):
+    if key in _models:
+        return _models[key]
+    with _lock:
+        if key not in _models:
+            memory_before = _peak_memory_mb()
+            started = time.perf_counter()
+            _models[key] = loader()
+            _stats[key] = {
+                'load_seconds': time.perf_counter() - started,
+                'peak_memory_mb': _peak_memory_mb(),
+                'memory_delta_mb': _peak_memory_mb() - memory_before,
+            }
+    return _models[key]
+
+# Function to load pipeline once per process
+# joblib.load instead of pycaret load_model - pycaret.classification is never imported,
+# only the pipeline classes needed for unpickling (no mmap_mode - the pickle is 4 KB, nothing to map)
+def load_pipeline(path=MODEL_PATH):
+    return _load(str(path), lambda: joblib.load(path))
+
+# Function to load compiled predictor - None when it was not compiled from current pipeline file
+# (sha256 saved at export differs, e.g. pipeline retrained or checked out without re-export)
+def _load_compiled(path, pipeline_path):
+    from compiled_predictor import CompiledPredictor, file_sha256
+    predictor = CompiledPredictor.load(path)
+    return predictor if predictor.source_sha256 == file_sha256(pipeline_path) else None
+
+# Function to load model used for predictions - compiled NumPy predictor (python compiled_predictor.py)
+# when it exists and matches pipeline file, otherwise the pipeline itself
+def load_predictor(path=PREDICTOR_PATH, pipeline_path=MODEL_PATH):
+    path = Path(path)
+    predictor = _load(str(path), lambda: _load_compiled(path, pipeline_path)) if path.exists() else None
+    return predictor if predictor is not None else load_pipeline(pipeline_path)
+
+# Function to start loading in background thread (warm start while user reads Introduction)
+# - started once per process, later calls (every script rerun) return the same thread
+def preload():
+    global _preload_thread
+    with _lock:
+        if _preload_thread is None:
+            _preload_thread = threading.Thread(target=load_predictor, daemon=True)
+            _preload_thread.start()
+    return _preload_thread
+
+# Function to get load time / memory numbers of loaded pipelines
+def load_stats():
+    return dict(_stats)
+
+# Function to classify rows in inference service (model shared by all sessions, requests micro-batched)
+# rows - list of dicts with FEATURES, raises OSError when service is not reachable
+def predict_remote(rows, url=INFERENCE_URL, timeout=INFERENCE_TIMEOUT):
+    request = urllib.request.Request(f"{url.rstrip('/')}/predict/iris", data=json.dumps({'rows': rows}).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())['labels']
+
+# Cold start benchmark - old path (pycaret load_model) vs registry, each in fresh interpreter
+if __name__ == '__main__':
+    import subprocess
+
+    model_dir = MODEL_PATH.parent
+    snippets = {
+        'pycaret load_model': (
+            "from pycaret.classification import load_model; "
+            f"load_model({str(MODEL_PATH.with_suffix(''))!r}, verbose=False)"
+        ),
+        'model_registry': (
+            f"import sys; sys.path.insert(0, {str(model_dir)!r}); "
+            "import model_registry; model_registry.load_pipeline()"
+        ),
+    }
+    for name, snippet in snippets.items():
+        # peak memory from VmHWM (as in compiled_predictor.py) - ru_maxrss of child started from this process
+        # can include ours
+        code = (
+            "import time; started = time.perf_counter(); "
+            f"{snippet}; "
+            "peak = [line.split()[1] for line in open('/proc/self/status') if line.startswith('VmHWM')][0]; "
+            "print(f'{time.perf_counter() - started:.2f} s, {int(peak) / 1024:.0f} MB peak')"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        print(f"{name}: {result.stdout.strip().splitlines()[-1] if result.stdout.strip() else result.stderr}")
@@ -0,0 +1,182 @@
+#Imports
+
+import hashlib
+import numpy as np
+import pandas as pd
+
+# One-pass statistics for iris-like measurement files - memory does not grow with file size
+CHUNK_SIZE = 100_000
+HISTOGRAM_VALUES = 50_000
+SAMPLE_SIZE = 2000
+
+# Quantile sketch (merging t-digest) - centroids sized by k1 scale function, vectorized compress;
+# quantiles are approximate (exact at min / max, error smallest near the tails)
+class QuantileSketch:
+    def __init__(self, compression=100):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))]))
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = np.floor(self.compression * (np.arcsin(2 * q - 1) / np.pi + 0.5))
+        starts = np.flatnonzero(np.r_[True, np.diff(k) > 0])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    @property
+    def count(self):
+        return self.weights.sum()
+
+    def quantile(self, q):
+        if not len(self.means):
+            return np.nan
+        cumulative = np.cumsum(self.weights)
+        centers = (cumulative - self.weights / 2) / cumulative[-1]
+        return float(np.interp(q, np.r_[0.0, centers, 1.0], np.r_[self.min, self.means, self.max]))
+
+# Function to draw reservoir sample chunk by chunk (Algorithm R, vectorized)
+def _update_reservoir(reservoir, seen, chunk, rng, size):
+    if reservoir is None:
+        reservoir = chunk.iloc[:0]
+    if len(reservoir) < size:
+        taken = chunk.iloc[:size - len(reservoir)]
+        reservoir = pd.concat([reservoir, taken], ignore_index=True)
+        seen += len(taken)
+        chunk = chunk.iloc[len(taken):]
+    if len(chunk):
+        positions = rng.integers(0, seen + np.arange(1, len(chunk) + 1))
+        sources = np.flatnonzero(positions < size)[::-1]
+        # later rows win when they hit the same slot
+        targets, last = np.unique(positions[sources], return_index=True)
+        sources = sources[last]
+        for j in range(chunk.shape[1]):
+            reservoir.iloc[targets, j] = chunk.iloc[sources, j].to_numpy()
+        seen += len(chunk)
+    return reservoir, seen
+
+# Function to merge value counts - sorted distinct values, over `limit` values neighbours are merged
+# into weighted means (counts stop being exact)
+def _merge_counts(values, counts, new_values, new_counts, limit):
+    values, inverse = np.unique(np.concatenate([values, new_values]), return_inverse=True)
+    counts = np.bincount(inverse, weights=np.concatenate([counts, new_counts]))
+    if len(values) <= limit:
+        return values, counts, True
+    starts = np.linspace(0, len(values), limit // 2, endpoint=False).astype(int)
+    merged = np.add.reduceat(counts, starts)
+    return np.add.reduceat(values * counts, starts) / merged, merged, False
+
+# Streaming stats engine - Welford/Chan moments, co-moment matrix, value counts for histograms,
+# per-class quantile sketches and a bounded sample for scatterplots
+class StreamingStats:
+    def __init__(self, features, class_column, seed=123):
+        self.features = list(features)
+        self.class_column = class_column
+        dims = len(self.features)
+        self.count = 0
+        self.mean = np.zeros(dims)
+        self.comoment = np.zeros((dims, dims))
+        self.minimum = np.full(dims, np.inf)
+        self.maximum = np.full(dims, -np.inf)
+        # counts of distinct values per feature - measurements have few of them, so histograms are exact;
+        # more than HISTOGRAM_VALUES distinct values are merged (histogram_exact False)
+        self.values = [np.empty(0) for _ in self.features]
+        self.value_counts = [np.empty(0) for _ in self.features]
+        self.histogram_exact = [True for _ in self.features]
+        self.sketches = {}
+        self.class_counts = {}
+        self.sample = None
+        self._seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._hash = hashlib.sha256()
+
+    def update(self, chunk):
+        chunk = chunk[self.features + [self.class_column]].dropna(subset=self.features)
+        if not len(chunk):
+            return self
+        X = chunk[self.features].to_numpy(dtype=np.float64)
+        self._hash.update(pd.util.hash_pandas_object(chunk, index=False).values.tobytes())
+
+        # Moments - merge chunk mean / co-moment into running ones (Chan et al.)
+        n = len(X)
+        chunk_mean = X.mean(axis=0)
+        centered = X - chunk_mean
+        delta = chunk_mean - self.mean
+        total = self.count + n
+        self.comoment += centered.T @ centered + np.outer(delta, delta) * self.count * n / total
+        self.mean += delta * n / total
+        self.count = total
+        self.minimum = np.minimum(self.minimum, X.min(axis=0))
+        self.maximum = np.maximum(self.maximum, X.max(axis=0))
+
+        # Histograms - value counts per feature
+        for i in range(len(self.features)):
+            values, counts = np.unique(X[:, i], return_counts=True)
+            self.values[i], self.value_counts[i], exact = _merge_counts(
+                self.values[i], self.value_counts[i], values, counts, HISTOGRAM_VALUES)
+            self.histogram_exact[i] = self.histogram_exact[i] and exact
+
+        # Quantile sketches per class and feature
+        for label, group in chunk.groupby(self.class_column, sort=False):
+            self.class_counts[label] = self.class_counts.get(label, 0) + len(group)
+            for col in self.features:
+                self.sketches.setdefault((label, col), QuantileSketch()).update(group[col].to_numpy())
+
+        self.sample, self._seen = _update_reservoir(self.sample, self._seen, chunk, self._rng, SAMPLE_SIZE)
+        return self
+
+    @property
+    def content_hash(self):
+        return self._hash.hexdigest()
+
+    def variance(self):
+        return pd.Series(np.diag(self.comoment) / max(self.count - 1, 1), index=self.features)
+
+    def correlation(self):
+        scale = np.sqrt(np.diag(self.comoment))
+        return pd.DataFrame(self.comoment / np.outer(scale, scale), index=self.features, columns=self.features)
+
+    # Histogram with `bins` bins over observed min..max - same counts and edges as np.histogram of the column
+    # (while histogram_exact)
+    def histogram(self, col, bins=20):
+        i = self.features.index(col)
+        counts, edges = np.histogram(self.values[i], bins=bins, range=(self.minimum[i], self.maximum[i]),
+                                     weights=self.value_counts[i])
+        return counts.round().astype(np.int64), edges
+
+    # Boxplot stats per class in matplotlib Axes.bxp format - quartiles and whiskers from t-digest
+    # sketches, so approximate
+    def boxplot_stats(self, col):
+        stats = []
+        for label in self.class_counts:
+            sketch = self.sketches[(label, col)]
+            q1, med, q3 = (sketch.quantile(q) for q in (0.25, 0.5, 0.75))
+            low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+            # whiskers at most extreme values inside fences (centroids stand in for raw points)
+            points = np.r_[sketch.min, sketch.means, sketch.max]
+            inside = points[(points >= low) & (points <= high)]
+            whislo, whishi = (inside.min(), inside.max()) if len(inside) else (q1, q3)
+            fliers = sketch.means[(sketch.means < low) | (sketch.means > high)]
+            stats.append({'label': label, 'q1': q1, 'med': med, 'q3': q3, 'whislo': whislo, 'whishi': whishi, 'fliers': fliers})
+        return stats
+
+# Function to compute stats of CSV file chunk by chunk (columns renamed by position to `names`)
+def stats_from_csv(path, names, chunk_size=CHUNK_SIZE):
+    stats = StreamingStats(names[:-1], names[-1])
+    for chunk in pd.read_csv(path, chunksize=chunk_size, header=0, names=names):
+        stats.update(chunk)
+    return stats
@@ -0,0 +1,109 @@
+#Imports
+
+import argparse
+import csv
+import os
+import sqlite3
+import time
+from pathlib import Path
+import pandas as pd
+
+# Enrichment - extracted invoice items joined with clients / products by indexed SQLite lookups
+# (only ids of new invoices are queried, cost does not grow with size of clients / products tables)
+DB_PATH = 'zad_domowe__clients.db'
+PRODUCTS_PATH = 'zad_domowe__products.csv'
+BATCH_SIZE = 500
+COLUMNS = ['customer_id', 'customer_name', 'email', 'phone', 'product_id', 'product_name', 'quantity', 'unit_price',
+           'invoice_number', 'date', 'company_name']
+
+def connect(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+# Function to detect CSV separator from file start (pandas C parser is used for the whole file)
+def sniff_separator(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        sample = f.read(64 * 1024)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=',;\t|').delimiter
+    except csv.Error:
+        return ','
+
+# Function to copy products CSV into database with index on id - skipped when file did not change
+def ingest_products(conn, products_path=PRODUCTS_PATH):
+    stat = Path(products_path).stat()
+    conn.execute("CREATE TABLE IF NOT EXISTS ingested_files (path TEXT PRIMARY KEY, size INTEGER, mtime REAL)")
+    row = conn.execute("SELECT size, mtime FROM ingested_files WHERE path = ?", (str(products_path),)).fetchone()
+    if row == (stat.st_size, stat.st_mtime):
+        return False
+    products = pd.read_csv(products_path, sep=sniff_separator(products_path))
+    with conn:
+        products.to_sql('products', conn, if_exists='replace', index=False, chunksize=10_000)
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS products_id ON products (id)")
+        conn.execute("INSERT OR REPLACE INTO ingested_files (path, size, mtime) VALUES (?, ?, ?)",
+                     (str(products_path), stat.st_size, stat.st_mtime))
+    return True
+
+# Function to make sure clients can be found by id without full table scan
+def ensure_indexes(conn):
+    with conn:
+        conn.execute("CREATE INDEX IF NOT EXISTS clients_id ON clients (id)")
+
+# Function to read rows by ids - {id: row}, ids queried in batches (SQLite limits number of parameters)
+def _lookup(conn, table, columns, ids, batch_size=BATCH_SIZE):
+    ids = sorted(set(ids))
+    found = {}
+    for start in range(0, len(ids), batch_size):
+        batch = ids[start:start + batch_size]
+        query = f"SELECT id, {', '.join(columns)} FROM {table} WHERE id IN ({', '.join('?' * len(batch))})"
+        for row in conn.execute(query, batch):
+            found[row[0]] = row[1:]
+    return found
+
+# Function to enrich invoices (InvoiceInfo) - returns final rows (one per item, columns as final_data.csv);
+# unknown client / product leaves its columns empty, like left merge in notebook
+def enrich_invoices(conn, invoices):
+    invoices = list(invoices)
+    clients = _lookup(conn, 'clients', ['name', 'email', 'phone'], [invoice.customer_id for invoice in invoices])
+    products = _lookup(conn, 'products', ['name'], [item.product_id for invoice in invoices for item in invoice.items])
+    rows = []
+    for invoice in invoices:
+        name, email, phone = clients.get(invoice.customer_id, (None, None, None))
+        for item in invoice.items:
+            rows.append({
+                'customer_id': invoice.customer_id,
+                'customer_name': name,
+                'email': email,
+                'phone': phone,
+                'product_id': item.product_id,
+                'product_name': products.get(item.product_id, (None,))[0],
+                'quantity': item.quantity,
+                'unit_price': item.price,
+                'invoice_number': invoice.invoice_number,
+                'date': invoice.date.strftime('%Y-%m-%d'),
+                'company_name': invoice.company_name,
+            })
+    return rows
+
+# CLI: python enrichment.py [--progress extracted_invoices.jsonl] [--output final_data.csv]
+if __name__ == '__main__':
+    from invoice_extraction import InvoiceInfo, PROGRESS_FILE, load_progress
+
+    parser = argparse.ArgumentParser(description="Enrich extracted invoices with clients and products")
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--products', default=PRODUCTS_PATH)
+    parser.add_argument('--progress', default=PROGRESS_FILE, help="invoices extracted by invoice_extraction.py")
+    parser.add_argument('--output', default='final_data.csv')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    conn = connect(args.db)
+    if os.path.exists(args.products):
+        print(f"Products ingested: {ingest_products(conn, args.products)}")
+    ensure_indexes(conn)
+    invoices = [InvoiceInfo(**record['invoice']) for record in load_progress(args.progress).values()]
+    rows = enrich_invoices(conn, invoices)
+    pd.DataFrame(rows, columns=COLUMNS).to_csv(args.output, index=False, sep=';', encoding='utf-8')
+    conn.close()
+    print(f"{len(invoices)} invoices, {len(rows)} rows -> {args.output} in {time.perf_counter() - started:.2f} s")
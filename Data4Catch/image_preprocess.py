@@ -0,0 +1,192 @@
+#Imports
+
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from getpass import getpass
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+# Image preprocessing - invoice scans shrunk before upload (margins cropped, grayscale, downscaled,
+# re-encoded as JPEG / WebP); text stays readable, upload size and image tokens drop
+MAX_SIDE = 1600
+FORMAT = 'JPEG'
+QUALITY = 70
+MIME = {'JPEG': 'image/jpeg', 'WEBP': 'image/webp', 'PNG': 'image/png'}
+FIELDS = ('company_name', 'customer_id', 'customer_name', 'invoice_number', 'date', 'items')
+
+# Function to crop white margins (pixels lighter than threshold), padding keeps text off the edge
+def crop_margins(image, threshold=235, padding=16):
+    ink = ImageOps.invert(image.convert('L')).point(lambda value: 255 if value > 255 - threshold else 0)
+    box = ink.getbbox()
+    if not box:
+        return image
+    left, top, right, bottom = box
+    return image.crop((max(left - padding, 0), max(top - padding, 0),
+                       min(right + padding, image.width), min(bottom + padding, image.height)))
+
+# Function to shrink one image - returns (bytes, mime type)
+def preprocess_image(data, max_side=MAX_SIDE, grayscale=True, crop=True, image_format=FORMAT, quality=QUALITY):
+    image = Image.open(io.BytesIO(data))
+    image = image.convert('L' if grayscale else 'RGB')
+    if crop:
+        image = crop_margins(image)
+    if max(image.size) > max_side:
+        image.thumbnail((max_side, max_side), Image.LANCZOS)
+    buffer = io.BytesIO()
+    options = {'optimize': True} if image_format == 'JPEG' else {'method': 4}
+    image.save(buffer, format=image_format, quality=quality, **options)
+    return buffer.getvalue(), MIME[image_format]
+
+def _preprocess_file(path, options):
+    return preprocess_image(Path(path).read_bytes(), **options)
+
+# Function to shrink many files in process pool - returns list of (bytes, mime type) in order of paths
+def preprocess_files(paths, n_jobs=None, **options):
+    with ProcessPoolExecutor(n_jobs, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return list(pool.map(_preprocess_file, paths, [options] * len(paths)))
+
+# Function to render local fixture set - synthetic invoice PNGs (A4, 150 dpi) with ground truth JSON beside them
+def make_fixtures(directory, count=10, seed=123):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    try:
+        font, small = ImageFont.truetype('DejaVuSans.ttf', 34), ImageFont.truetype('DejaVuSans.ttf', 24)
+    except OSError:
+        font, small = ImageFont.load_default(34), ImageFont.load_default(24)
+    for i in range(1, count + 1):
+        items = [
+            {"description": f"Produkt {product_id}", "product_id": product_id,
+             "quantity": rng.randint(1, 9), "price": round(rng.uniform(5, 500), 2)}
+            for product_id in rng.sample(range(1, 50), rng.randint(1, 6))
+        ]
+        invoice = {
+            "company_name": rng.choice(["Kowalski i Synowie Sp. z o.o.", "Nowak Handel S.A.", "Zielińska Usługi"]),
+            "customer_id": rng.randint(1, 100),
+            "customer_name": rng.choice(["Jan Kowalski", "Anna Nowak", "Paweł Wiśniewski", "Ewa Zając"]),
+            "invoice_number": rng.randint(10_000, 99_999),
+            "date": str(date(2024, 1, 1) + timedelta(days=rng.randint(0, 365))),
+            "items": items,
+        }
+        image = Image.new('RGB', (1240, 1754), 'white')
+        draw = ImageDraw.Draw(image)
+        draw.text((150, 180), invoice["company_name"], fill='black', font=font)
+        draw.text((150, 260), f"Faktura nr {invoice['invoice_number']}    Data: {invoice['date']}", fill='black', font=small)
+        draw.text((150, 310), f"Klient: {invoice['customer_name']} (ID {invoice['customer_id']})", fill='black', font=small)
+        draw.line((150, 400, 1090, 400), fill='black', width=2)
+        for x, header in ((150, "Opis"), (500, "ID produktu"), (720, "Ilość"), (860, "Cena")):
+            draw.text((x, 420), header, fill='black', font=small)
+        for row, item in enumerate(items):
+            y = 480 + row * 50
+            draw.text((150, y), item["description"], fill='black', font=small)
+            draw.text((500, y), str(item["product_id"]), fill='black', font=small)
+            draw.text((720, y), str(item["quantity"]), fill='black', font=small)
+            draw.text((860, y), f"{item['price']:.2f} zł", fill='black', font=small)
+        # light scanner noise - fixtures compress like real scans, not like flat synthetic images
+        noise = Image.effect_noise(image.size, 20).convert('RGB')
+        image = Image.blend(image, noise, 0.08)
+        stem = f"zad_domowe__invoice{i:02d}"
+        image.save(directory / f"{stem}.png")
+        (directory / f"{stem}.json").write_text(json.dumps(invoice, ensure_ascii=False, indent=2), encoding='utf-8')
+    return directory
+
+# Function to compare extracted invoice with reference - {field: True/False}
+def field_accuracy(reference, extracted):
+    reference, extracted = reference.model_dump(mode='json'), extracted.model_dump(mode='json')
+    return {field: reference[field] == extracted[field] for field in FIELDS}
+
+# Function to extract directory twice (original images, preprocessed ones) and compare bytes sent,
+# time and per-field accuracy; reference is <image>.json ground truth, else answer for original image
+async def compare(client, directory, options=None, pattern=None, concurrency=4):
+    from invoice_extraction import InvoiceInfo, PATTERN, extract_directory
+
+    directory = Path(directory)
+    options = options or {}
+    runs = {}
+    with tempfile.TemporaryDirectory() as progress_dir:
+        for name, preprocess in (('original', None), ('preprocessed', options)):
+            runs[name] = await extract_directory(
+                client, directory, pattern or PATTERN, concurrency,
+                progress_path=Path(progress_dir) / f'{name}.jsonl', preprocess=preprocess,
+            )
+
+    originals = runs['original'][0]
+    report = {'options': options, 'runs': {}}
+    for name, (invoices, run_report) in runs.items():
+        scores = {field: [] for field in FIELDS}
+        for file_name, invoice in invoices.items():
+            truth_path = directory / Path(file_name).with_suffix('.json').name
+            if truth_path.exists():
+                reference = InvoiceInfo(**json.loads(truth_path.read_text(encoding='utf-8')))
+            elif file_name in originals:
+                reference = originals[file_name]
+            else:
+                continue
+            for field, correct in field_accuracy(reference, invoice).items():
+                scores[field].append(correct)
+        report['runs'][name] = {
+            'bytes_sent': run_report['bytes_sent'],
+            'seconds': run_report['seconds'],
+            'failed': run_report['failed'],
+            'accuracy': {field: sum(values) / len(values) if values else None for field, values in scores.items()},
+        }
+    return report
+
+def print_comparison(report):
+    original, processed = report['runs']['original'], report['runs']['preprocessed']
+    print(f"Options: {report['options']}")
+    print(f"{'':>16} {'original':>12} {'preprocessed':>14}")
+    print(f"{'MB sent':>16} {original['bytes_sent'] / 1024 / 1024:>12.2f} {processed['bytes_sent'] / 1024 / 1024:>14.2f}")
+    print(f"{'seconds':>16} {original['seconds']:>12.1f} {processed['seconds']:>14.1f}")
+    print(f"{'failed':>16} {original['failed']:>12} {processed['failed']:>14}")
+    for field in FIELDS:
+        values = [run['accuracy'][field] for run in (original, processed)]
+        cells = [f"{value:.0%}" if value is not None else '-' for value in values]
+        print(f"{field:>16} {cells[0]:>12} {cells[1]:>14}")
+
+# Report: python image_preprocess.py <invoice dir> [--fixtures 10] [--format WEBP --quality 60] [--base-url ...]
+# (size-only report without API: --sizes-only)
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare extraction on original and preprocessed invoice images")
+    parser.add_argument('directory')
+    parser.add_argument('--fixtures', type=int, default=0, help="render N synthetic invoices into directory first")
+    parser.add_argument('--format', default=FORMAT, choices=['JPEG', 'WEBP'])
+    parser.add_argument('--quality', type=int, default=QUALITY)
+    parser.add_argument('--max-side', type=int, default=MAX_SIDE)
+    parser.add_argument('--color', action='store_true', help="keep colors")
+    parser.add_argument('--no-crop', action='store_true')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--base-url', default=os.environ.get('OPENAI_BASE_URL'))
+    parser.add_argument('--sizes-only', action='store_true', help="only measure preprocessing, no API calls")
+    args = parser.parse_args()
+
+    if args.fixtures:
+        make_fixtures(args.directory, args.fixtures)
+    options = {'max_side': args.max_side, 'grayscale': not args.color, 'crop': not args.no_crop,
+               'image_format': args.format, 'quality': args.quality}
+    if args.sizes_only:
+        paths = sorted(Path(args.directory).glob('*.png'))
+        if not paths:
+            sys.exit("No PNG files found.")
+        started = time.perf_counter()
+        shrunk = preprocess_files(paths, **options)
+        elapsed = time.perf_counter() - started
+        before = sum(path.stat().st_size for path in paths)
+        after = sum(len(data) for data, mime in shrunk)
+        print(f"{len(paths)} images: {before / 1024:.0f} KB -> {after / 1024:.0f} KB "
+              f"({after / before:.1%}) in {elapsed:.2f} s")
+    else:
+        from invoice_extraction import make_client
+        api_key = os.environ.get('OPENAI_API_KEY') or getpass("OpenAI key: ")
+        print_comparison(asyncio.run(compare(make_client(api_key, args.base_url), args.directory, options,
+                                             concurrency=args.concurrency)))
@@ -0,0 +1,257 @@
+#Imports
+
+import argparse
+import asyncio
+import base64
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from getpass import getpass
+from pathlib import Path
+import instructor
+import openai
+import pandas as pd
+from openai import AsyncOpenAI
+from pydantic import BaseModel
+
+# Invoice extraction - invoice images sent to OpenAI concurrently (bounded), every answer appended
+# to progress file at once, so interrupted run continues with files not extracted yet
+MODEL = "gpt-4o"
+PROMPT = "Pobierz proszę informacje na temat faktury"
+PATTERN = "zad_domowe__invoice*.png"
+PROGRESS_FILE = "extracted_invoices.jsonl"
+CONCURRENCY = 4
+RETRY_ATTEMPTS = 6
+RETRY_BASE_DELAY = 1.0
+RETRYABLE = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError, openai.APITimeoutError)
+
+# Class InvoiceInfoItem
+class InvoiceInfoItem(BaseModel):
+    description: str
+    product_id: int
+    quantity: int
+    price: float
+
+# Class InvoiceInfo
+class InvoiceInfo(BaseModel):
+    company_name: str
+    customer_id: int
+    customer_name: str
+    invoice_number: int
+    date: date
+    items: list[InvoiceInfoItem]
+
+# Function to connect with OpenAI (base_url -> local stub or proxy, None -> OPENAI_BASE_URL / api.openai.com)
+def make_client(api_key, base_url=None):
+    # retries are done by _with_retries (Retry-After aware, counted in report)
+    return instructor.from_openai(AsyncOpenAI(api_key=api_key, base_url=base_url or None, max_retries=0))
+
+def file_hash(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+# Function to read extracted invoices from progress file - {sha256: record}
+def load_progress(path):
+    done = {}
+    if Path(path).exists():
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # last line cut by interrupted run
+                    continue
+                done[record['sha256']] = record
+    return done
+
+# Function to wait before next attempt - Retry-After header if API sent it, else exponential backoff with jitter
+def _retry_delay(error, attempt):
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return RETRY_BASE_DELAY * 2 ** attempt * (1 + random.random())
+
+def _retryable(error):
+    # instructor wraps errors raised inside its own retry loop
+    return isinstance(error, RETRYABLE) or isinstance(getattr(error, '__cause__', None), RETRYABLE)
+
+async def _with_retries(call, stats, attempts=RETRY_ATTEMPTS):
+    for attempt in range(attempts):
+        try:
+            return await call()
+        except Exception as error:
+            if not _retryable(error) or attempt == attempts - 1:
+                raise
+            stats['retries'] += 1
+            await asyncio.sleep(_retry_delay(error, attempt))
+
+# Function to extract one invoice image
+async def extract_invoice(client, image, model=MODEL, detail="high", stats=None, mime="image/png"):
+    image_data = base64.b64encode(image).decode('utf-8')
+    stats = stats if stats is not None else {'retries': 0, 'bytes_sent': 0}
+    stats['bytes_sent'] = stats.get('bytes_sent', 0) + len(image_data)
+    return await _with_retries(lambda: client.chat.completions.create(
+        model=model,
+        response_model=InvoiceInfo,
+        max_retries=1,
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        #Instrukcja dla AI
+                        "text": PROMPT,
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{mime};base64,{image_data}",
+                            "detail": detail
+                        },
+                    },
+                ],
+            },
+        ],
+    ), stats)
+
+# Function to extract all invoices of directory - returns ({file name: InvoiceInfo}, report)
+# files already in progress file (same content hash) are not sent again,
+# preprocess=dict of image_preprocess.preprocess_image options shrinks images in process pool before upload
+async def extract_directory(client, directory, pattern=PATTERN, concurrency=CONCURRENCY, progress_path=None,
+                            model=MODEL, detail="high", on_result=None, preprocess=None):
+    directory = Path(directory)
+    progress_path = Path(progress_path or directory / PROGRESS_FILE)
+    done = load_progress(progress_path)
+    stats = {'retries': 0, 'bytes_sent': 0}
+    invoices, failed, latencies = {}, {}, []
+    pool = None
+    if preprocess is not None:
+        from image_preprocess import preprocess_image
+        shrink = functools.partial(preprocess_image, **preprocess)
+        pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+    skipped = 0
+    started = time.perf_counter()
+
+    async def process(path, progress):
+        nonlocal skipped
+        image = await asyncio.to_thread(path.read_bytes)
+        digest = hashlib.sha256(image).hexdigest()
+        if digest in done:
+            invoices[path.name] = InvoiceInfo(**done[digest]['invoice'])
+            skipped += 1
+            return
+        mime = "image/png"
+        if pool:
+            image, mime = await asyncio.get_running_loop().run_in_executor(pool, shrink, image)
+        call_started = time.perf_counter()
+        try:
+            invoice = await extract_invoice(client, image, model, detail, stats, mime)
+        except Exception as error:
+            failed[path.name] = f"{type(error).__name__}: {error}"
+            return
+        latencies.append(time.perf_counter() - call_started)
+        invoices[path.name] = invoice
+        record = {'file': path.name, 'sha256': digest, 'invoice': invoice.model_dump(mode='json'),
+                  'seconds': round(latencies[-1], 3)}
+        # one write per line - whole line lands in file or (on crash) is dropped by load_progress
+        progress.write(json.dumps(record, ensure_ascii=False) + '\n')
+        progress.flush()
+        done[digest] = record
+        if on_result:
+            on_result(path.name, invoice)
+
+    # fixed number of workers take files from shared iterator - file is read, preprocessed and sent by
+    # the same worker, so at most `concurrency` images are in memory at once
+    async def worker(pending, progress):
+        for path in pending:
+            await process(path, progress)
+
+    paths = sorted(directory.glob(pattern))
+    pending = iter(paths)
+    try:
+        with open(progress_path, 'a', encoding='utf-8') as progress:
+            await asyncio.gather(*(worker(pending, progress) for _ in range(concurrency)))
+    finally:
+        if pool:
+            pool.shutdown()
+    elapsed = time.perf_counter() - started
+    extracted = len(latencies)
+    report = {
+        'files': len(paths),
+        'extracted': extracted,
+        'skipped': skipped,
+        'failed': len(failed),
+        'errors': failed,
+        'retries': stats['retries'],
+        'bytes_sent': stats['bytes_sent'],
+        'seconds': elapsed,
+        'invoices_per_minute': extracted / elapsed * 60 if elapsed else 0.0,
+        'mean_latency': sum(latencies) / extracted if extracted else 0.0,
+        'concurrency': concurrency,
+    }
+    return dict(sorted(invoices.items())), report
+
+# Function to flatten invoices into orders table (one row per invoice item, as in notebook)
+def orders_frame(invoices):
+    orders = []
+    for invoice_info in invoices.values():
+        invoice_data = invoice_info.model_dump()
+        for item in invoice_data["items"]:
+            order = {
+                "company_name": invoice_data["company_name"],
+                "customer_id": invoice_data["customer_id"],
+                "customer_name": invoice_data["customer_name"],
+                "invoice_number": invoice_data["invoice_number"],
+                "date": invoice_data["date"],
+                "description": item["description"],
+                "product_id": item["product_id"],
+                "quantity": item["quantity"],
+                "price": item["price"],
+            }
+            orders.append(order)
+    return pd.DataFrame(orders)
+
+def print_report(report):
+    print(f"Files: {report['files']} · extracted: {report['extracted']} · skipped (already extracted): "
+          f"{report['skipped']} · failed: {report['failed']} · retries: {report['retries']} · "
+          f"sent: {report['bytes_sent'] / 1024 / 1024:.2f} MB")
+    print(f"Time: {report['seconds']:.1f} s · {report['invoices_per_minute']:.1f} invoices/min · "
+          f"mean API latency {report['mean_latency']:.2f} s · concurrency {report['concurrency']}")
+    for name, error in report['errors'].items():
+        print(f"  {name}: {error}")
+
+# CLI: python invoice_extraction.py <invoice dir> [--concurrency 8] [--base-url http://127.0.0.1:8100/v1]
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Extract invoice data from images with OpenAI")
+    parser.add_argument('directory', nargs='?', default='.')
+    parser.add_argument('--pattern', default=PATTERN)
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--progress', default=None, help=f"progress file (default <directory>/{PROGRESS_FILE})")
+    parser.add_argument('--model', default=MODEL)
+    parser.add_argument('--detail', default="high", choices=["high", "low", "auto"])
+    parser.add_argument('--base-url', default=os.environ.get('OPENAI_BASE_URL'))
+    parser.add_argument('--output', default=None, help="orders CSV (sep=';')")
+    parser.add_argument('--preprocess', action='store_true', help="downscale / grayscale / crop / re-encode before upload")
+    parser.add_argument('--format', default='JPEG', choices=['JPEG', 'WEBP'])
+    parser.add_argument('--quality', type=int, default=70)
+    parser.add_argument('--max-side', type=int, default=1600)
+    args = parser.parse_args()
+
+    api_key = os.environ.get('OPENAI_API_KEY') or getpass("OpenAI key: ")
+    client = make_client(api_key, args.base_url)
+    invoices, report = asyncio.run(extract_directory(
+        client, args.directory, args.pattern, args.concurrency, args.progress, args.model, args.detail,
+        on_result=lambda name, invoice: print(f"Processed {name}"),
+        preprocess={'max_side': args.max_side, 'image_format': args.format, 'quality': args.quality} if args.preprocess else None,
+    ))
+    print_report(report)
+    if args.output:
+        orders_frame(invoices).to_csv(args.output, index=False, sep=';', encoding='utf-8')
@@ -0,0 +1,137 @@
+#Imports
+
+import argparse
+import asyncio
+import csv
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from getpass import getpass
+from pathlib import Path
+from enrichment import COLUMNS
+
+# Output store - enriched invoice rows kept in SQLite (one invoice replaced as a whole when extracted again),
+# final CSV streamed from store, so new run only adds new invoices instead of rebuilding everything
+STORE_PATH = 'invoices.db'
+EXPORT_CHUNK = 10_000
+
+@contextmanager
+def connect(store_path=STORE_PATH):
+    conn = sqlite3.connect(store_path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS invoices (
+            invoice_number INTEGER PRIMARY KEY,
+            source TEXT,
+            source_sha256 TEXT,
+            updated REAL NOT NULL
+        )
+    """)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS invoice_rows (
+            invoice_number INTEGER NOT NULL REFERENCES invoices (invoice_number),
+            line INTEGER NOT NULL,
+            {', '.join(column for column in COLUMNS if column != 'invoice_number')},
+            PRIMARY KEY (invoice_number, line)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS invoices_source ON invoices (source_sha256)")
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+# Function to read hashes of source images already stored
+def stored_sources(conn):
+    return {row[0] for row in conn.execute("SELECT source_sha256 FROM invoices WHERE source_sha256 IS NOT NULL")}
+
+# Function to save rows of one invoice - replaces rows stored before for the same invoice_number
+def upsert_invoice(conn, invoice_number, rows, source=None, source_sha256=None):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            "INSERT INTO invoices (invoice_number, source, source_sha256, updated) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (invoice_number) DO UPDATE SET source = excluded.source, "
+            "source_sha256 = excluded.source_sha256, updated = excluded.updated",
+            (invoice_number, source, source_sha256, time.time()),
+        )
+        conn.execute("DELETE FROM invoice_rows WHERE invoice_number = ?", (invoice_number,))
+        conn.executemany(
+            f"INSERT INTO invoice_rows (line, {', '.join(COLUMNS)}) VALUES (?, {', '.join('?' * len(COLUMNS))})",
+            [(line, *(row[column] for column in COLUMNS)) for line, row in enumerate(rows)],
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+# Function to write store as CSV (sep=';', columns of final_data.csv) - streamed in chunks, file replaced atomically
+def export_csv(conn, output='final_data.csv', chunk_size=EXPORT_CHUNK):
+    output = Path(output)
+    tmp = output.with_suffix(f'.tmp{os.getpid()}')
+    cursor = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM invoice_rows ORDER BY invoice_number, line")
+    rows = 0
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(COLUMNS)
+        while chunk := cursor.fetchmany(chunk_size):
+            writer.writerows(chunk)
+            rows += len(chunk)
+    os.replace(tmp, output)
+    return rows
+
+# Function to run whole pipeline on invoice folder - only images not stored yet are extracted and enriched
+async def update_store(client, directory, store_path=STORE_PATH, db_path=None, products_path=None, output=None,
+                       concurrency=4, preprocess=None):
+    import enrichment
+    from invoice_extraction import PATTERN, PROGRESS_FILE, extract_directory, load_progress
+
+    directory = Path(directory)
+    extracted, report = await extract_directory(client, directory, PATTERN, concurrency, preprocess=preprocess)
+    records = load_progress(directory / PROGRESS_FILE)
+    lookups = enrichment.connect(db_path or directory / enrichment.DB_PATH)
+    products_path = Path(products_path or directory / enrichment.PRODUCTS_PATH)
+    if products_path.exists():
+        enrichment.ingest_products(lookups, products_path)
+    enrichment.ensure_indexes(lookups)
+    with connect(store_path) as conn:
+        done = stored_sources(conn)
+        new = [record for record in records.values() if record['sha256'] not in done and record['file'] in extracted]
+        for record in new:
+            invoice = extracted[record['file']]
+            rows = enrichment.enrich_invoices(lookups, [invoice])
+            upsert_invoice(conn, invoice.invoice_number, rows, record['file'], record['sha256'])
+        exported = export_csv(conn, output) if output else None
+    lookups.close()
+    report['stored'] = len(new)
+    report['exported_rows'] = exported
+    return report
+
+# CLI: python invoice_store.py <invoice dir> [--output final_data.csv] [--base-url http://127.0.0.1:8100/v1]
+if __name__ == '__main__':
+    from invoice_extraction import make_client, print_report
+
+    parser = argparse.ArgumentParser(description="Extract, enrich and store new invoices, export CSV")
+    parser.add_argument('directory', nargs='?', default='.')
+    parser.add_argument('--store', default=STORE_PATH)
+    parser.add_argument('--db', default=None, help="clients database (default <directory>/zad_domowe__clients.db)")
+    parser.add_argument('--products', default=None, help="products CSV (default <directory>/zad_domowe__products.csv)")
+    parser.add_argument('--output', default='final_data.csv')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--base-url', default=os.environ.get('OPENAI_BASE_URL'))
+    parser.add_argument('--export-only', action='store_true', help="only write CSV from store")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.export_only:
+        with connect(args.store) as conn:
+            rows = export_csv(conn, args.output)
+        print(f"{rows} rows -> {args.output} in {time.perf_counter() - started:.2f} s")
+    else:
+        api_key = os.environ.get('OPENAI_API_KEY') or getpass("OpenAI key: ")
+        report = asyncio.run(update_store(make_client(api_key, args.base_url), args.directory, args.store,
+                                          args.db, args.products, args.output, args.concurrency))
+        print_report(report)
+        print(f"New invoices stored: {report['stored']} · {report['exported_rows']} rows -> {args.output} "
+              f"in {time.perf_counter() - started:.2f} s")
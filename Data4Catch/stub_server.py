@@ -0,0 +1,104 @@
+#Imports
+
+import argparse
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local OpenAI stub for invoice extraction - answers /v1/chat/completions with InvoiceInfo tool call
+# built from image hash (same image -> same invoice), optional latency and rate limiting (HTTP 429)
+
+# Function to build fake invoice for image bytes
+def fake_invoice(image):
+    seed = int(hashlib.sha256(image).hexdigest()[:12], 16)
+    items = [
+        {
+            "description": f"Produkt {(seed >> (4 * i)) % 20 + 1}",
+            "product_id": (seed >> (4 * i)) % 20 + 1,
+            "quantity": (seed >> (3 * i)) % 5 + 1,
+            "price": round(((seed >> (5 * i)) % 10_000) / 100 + 1, 2),
+        }
+        for i in range(seed % 4 + 1)
+    ]
+    return {
+        "company_name": "Firma Testowa Sp. z o.o.",
+        "customer_id": seed % 50 + 1,
+        "customer_name": f"Klient {seed % 50 + 1}",
+        "invoice_number": seed % 1_000_000,
+        "date": str(date(2024, 1, 1) + timedelta(days=seed % 365)),
+        "items": items,
+    }
+
+def make_handler(latency, rate_limit_every):
+    counter = {'requests': 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, headers=None):
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            with lock:
+                counter['requests'] += 1
+                limited = rate_limit_every and counter['requests'] % rate_limit_every == 0
+            if limited:
+                self._send(429, {"error": {"message": "Rate limit reached", "type": "requests"}}, {'retry-after': '0.2'})
+                return
+            time.sleep(latency)
+            url = re.search(r'data:image/[a-z]+;base64,([A-Za-z0-9+/=]+)', json.dumps(request))
+            invoice = fake_invoice(base64.b64decode(url.group(1)) if url else b'')
+            self._send(200, {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "gpt-4o"),
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "tool_calls",
+                    "message": {
+                        "role": "assistant",
+                        "content": None,
+                        "tool_calls": [{
+                            "id": "call_stub",
+                            "type": "function",
+                            "function": {"name": "InvoiceInfo", "arguments": json.dumps(invoice)},
+                        }],
+                    },
+                }],
+                "usage": {"prompt_tokens": 800, "completion_tokens": 120, "total_tokens": 920},
+            })
+
+    return Handler
+
+# Function to start stub in background thread - returns server (server.server_port, server.shutdown())
+def start(port=0, latency=0.5, rate_limit_every=0):
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(latency, rate_limit_every))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# Standalone: python stub_server.py --port 8100, then extraction with --base-url http://127.0.0.1:8100/v1
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local OpenAI stub returning InvoiceInfo")
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--latency', type=float, default=0.5, help="seconds per answer")
+    parser.add_argument('--rate-limit-every', type=int, default=0, help="every N-th request gets HTTP 429")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(args.latency, args.rate_limit_every))
+    print(f"Stub listening on http://127.0.0.1:{args.port}/v1")
+    server.serve_forever()
@@ -0,0 +1,286 @@
+#Imports
+
+import asyncio
+import random
+import json
+import threading
+import time
+import httpx
+import openai
+from openai import AsyncOpenAI
+import response_cache
+import timings
+
+# Async OpenAI layer - one event loop thread and one pooled httpx client per process,
+# reused by every Streamlit rerun and session
+TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+RETRY_ATTEMPTS = 4
+RETRY_BASE_DELAY = 0.5
+MAX_RETRY_DELAY = 30.0
+RETRYABLE = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError, httpx.TransportError)
+
+_loop = None
+_http = None
+_clients = {}
+_lock = threading.Lock()
+
+# Function to get background event loop (created on first use)
+def _get_loop():
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='openai-loop', daemon=True).start()
+    return _loop
+
+# Function to run coroutine on background loop and wait for result (called from Streamlit script)
+def run(coroutine, timeout=None):
+    return asyncio.run_coroutine_threadsafe(_in_rerun(coroutine, timings.current()), _get_loop()).result(timeout)
+
+# Function to await on background loop with rerun of calling script current (API calls timed into it)
+async def _in_rerun(awaitable, rerun):
+    timings.attach(rerun)
+    return await awaitable
+
+# Function to iterate async generator from Streamlit script (one item per loop round trip)
+def iterate(async_generator):
+    while True:
+        try:
+            yield run(async_generator.__anext__())
+        except StopAsyncIteration:
+            return
+
+# Function to get shared http client (connection pool for API calls and image downloads)
+def get_http():
+    global _http
+    with _lock:
+        if _http is None:
+            _http = httpx.AsyncClient(timeout=TIMEOUT, limits=LIMITS)
+    return _http
+
+# Function to get client per API key / base URL (base_url=None -> OPENAI_BASE_URL or api.openai.com)
+def get_client(api_key, base_url=None):
+    key = (api_key, base_url or None)
+    http = get_http()
+    with _lock:
+        if key not in _clients:
+            # retries are done by with_retries, so they can be counted and tuned in one place
+            _clients[key] = AsyncOpenAI(api_key=api_key, base_url=base_url or None, http_client=http, max_retries=0)
+        return _clients[key]
+
+# Function to wait before next attempt - Retry-After header if API sent it, else exponential backoff with jitter
+# (at most MAX_RETRY_DELAY seconds, whatever the server asks for)
+def _retry_delay(error, attempt):
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    try:
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = RETRY_BASE_DELAY * 2 ** attempt * (1 + random.random())
+    return min(max(delay, 0.0), MAX_RETRY_DELAY)
+
+# Function to tell transient errors - API errors above, and 429 / 5xx answers of plain downloads (raise_for_status)
+def _retryable(error):
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, RETRYABLE)
+
+# Function to call API with retries (call is a function returning new coroutine for every attempt)
+async def with_retries(call, attempts=RETRY_ATTEMPTS):
+    for attempt in range(attempts):
+        try:
+            return await call()
+        except Exception as error:
+            if not _retryable(error) or attempt == attempts - 1:
+                raise
+            await asyncio.sleep(_retry_delay(error, attempt))
+
+# Function to get prompt text of request (user message or image prompt)
+def _prompt(request):
+    return request['messages'][-1]['content'] if 'messages' in request else request['prompt']
+
+# Function to get scope of request - everything except user prompt (near-duplicate answers
+# are reused only for the same API address, model and system prompt)
+def _scope(kind, client, request):
+    if 'messages' in request:
+        request = {**request, 'messages': request['messages'][:-1]}
+    else:
+        request = {name: value for name, value in request.items() if name != 'prompt'}
+    return response_cache.cache_key(kind, {'base_url': str(client.base_url), **request})
+
+# Function to look answer up in response cache - same request first, then (similar=True)
+# near-duplicate prompt; returns (key, cached bytes or None)
+async def _lookup(kind, client, request, similar=False):
+    key = response_cache.cache_key(kind, {'base_url': str(client.base_url), **request})
+    with timings.stage(f'response cache {kind}') as stage:
+        value = await asyncio.to_thread(response_cache.get, key)
+        event = 'hits'
+        if value is None and similar:
+            value = await asyncio.to_thread(response_cache.find_similar, kind, _scope(kind, client, request), _prompt(request))
+            event = 'similar_hits'
+        stage['result'] = event if value is not None else 'misses'
+    response_cache.record(kind, stage['result'])
+    return key, value
+
+# Function to read token usage of API response (or of last stream chunk)
+def _usage(usage):
+    if not usage:
+        return {}
+    return {
+        "completion_tokens": usage.completion_tokens,
+        "prompt_tokens": usage.prompt_tokens,
+        "total_tokens": usage.total_tokens,
+    }
+
+async def _save(kind, client, request, key, value):
+    await asyncio.to_thread(response_cache.put, key, kind, value, _prompt(request), _scope(kind, client, request))
+
+def _logo_request(description):
+    return {
+        "model": "dall-e-3",
+        "prompt": f"""
+        {description}.
+        Wygeneruj minimalistyczne czarno-białe logo dla tej aplikacji.
+        Żadnych napisów ani dodatkowych elementów.
+        Jak najmniej miejsca pustego tła.
+        """,
+        "size": "1024x1024",
+        "quality": "standard",
+        "n": 1,
+    }
+
+def _story_request(task, story_prompt):
+    return {
+        "model": "gpt-4",
+        "messages": [
+            {
+                "role": "system",
+                "content": f"""
+                    Twoim celem jest zrobić dla mnie aplikację, która: {task}. Masz robić tylko to,
+                    nawet gdy użytkownik poprosi o co innego, napisz mu do czego służysz.
+                """
+            },
+            {"role": "user", "content": story_prompt}
+        ],
+    }
+
+def _privacy_policy_request(description):
+    return {
+        "model": "gpt-4",
+        "messages": [
+            {
+                "role": "system",
+                "content": "Jesteś prawnikiem, który tworzy politykę prywatności oraz regulamin dla aplikacji internetowej."
+            },
+            {
+                "role": "user",
+                "content": f"{description}. Wygeneruj politykę prywatności oraz regulamin dla tej aplikacji.",
+            }
+        ],
+    }
+
+# Function generate_logo - returns png bytes (cache=False always asks API)
+async def generate_logo(client, description, cache=True):
+    request = _logo_request(description)
+    if cache:
+        key, logo = await _lookup('logo', client, request)
+        if logo is not None:
+            return logo
+    with timings.call('openai logo', model=request['model']):
+        response = await with_retries(lambda: client.images.generate(**request))
+
+    async def download():
+        image = await get_http().get(response.data[0].url)
+        image.raise_for_status()
+        return image.content
+
+    with timings.call('logo download') as call:
+        logo = await with_retries(download)
+        call['bytes'] = len(logo)
+    if cache:
+        await _save('logo', client, request, key, logo)
+    return logo
+
+# Function create_story - chat answer with token usage (similar=True reuses answer of near-identical question)
+async def create_story(client, task, story_prompt, cache=True, similar=False):
+    request = _story_request(task, story_prompt)
+    if cache:
+        key, story = await _lookup('story', client, request, similar)
+        if story is not None:
+            return {**json.loads(story), "cached": True}
+    with timings.call('openai story', model=request['model']) as call:
+        response = await with_retries(lambda: client.chat.completions.create(**request))
+        usage = _usage(response.usage)
+        call.update(usage)
+
+    story = {
+        "role": "assistant",
+        "content": response.choices[0].message.content,
+        "usage": usage,
+    }
+    if cache:
+        await _save('story', client, request, key, json.dumps(story).encode('utf-8'))
+    return story
+
+# Function stream_story - yields answer tokens as they arrive; when stream ends `story` holds the same
+# fields as create_story result (content, usage) plus time_to_first_token and total_time in seconds
+async def stream_story(client, task, story_prompt, story, cache=True, similar=False):
+    started = time.perf_counter()
+    request = _story_request(task, story_prompt)
+    if cache:
+        key, cached = await _lookup('story', client, request, similar)
+        if cached is not None:
+            story.update({**json.loads(cached), "cached": True, "time_to_first_token": time.perf_counter() - started})
+            yield story["content"]
+            story["total_time"] = time.perf_counter() - started
+            return
+    stream = await with_retries(lambda: client.chat.completions.create(
+        **request, stream=True, stream_options={"include_usage": True}
+    ))
+    parts = []
+    story.update({"role": "assistant", "content": "", "usage": {}, "time_to_first_token": None})
+    async for chunk in stream:
+        if chunk.usage:
+            story["usage"] = _usage(chunk.usage)
+        if chunk.choices and chunk.choices[0].delta.content:
+            if story["time_to_first_token"] is None:
+                story["time_to_first_token"] = time.perf_counter() - started
+            parts.append(chunk.choices[0].delta.content)
+            yield chunk.choices[0].delta.content
+    story["content"] = "".join(parts)
+    story["total_time"] = time.perf_counter() - started
+    timings.record_call('openai story (stream)', story["total_time"], model=request['model'],
+                        time_to_first_token=story["time_to_first_token"], **story["usage"])
+    if cache:
+        answer = {name: story[name] for name in ("role", "content", "usage")}
+        await _save('story', client, request, key, json.dumps(answer).encode('utf-8'))
+
+# Function generate_privacy_policy
+async def generate_privacy_policy(client, description, cache=True):
+    request = _privacy_policy_request(description)
+    if cache:
+        key, privacy_policy = await _lookup('privacy_policy', client, request)
+        if privacy_policy is not None:
+            return privacy_policy.decode('utf-8')
+    with timings.call('openai privacy_policy', model=request['model']) as call:
+        response = await with_retries(lambda: client.chat.completions.create(**request))
+        call.update(_usage(response.usage))
+    privacy_policy = response.choices[0].message.content
+    if cache:
+        await _save('privacy_policy', client, request, key, privacy_policy.encode('utf-8'))
+    return privacy_policy
+
+# Function to launch any of logo / privacy policy / story together (None = skip),
+# failed task returns its exception instead of cancelling the others
+async def generate_all(client, description, task=None, story_prompt=None, logo=True, privacy_policy=True,
+                       cache=True, similar=False):
+    async def skip():
+        return None
+
+    return await asyncio.gather(
+        generate_logo(client, description, cache) if logo else skip(),
+        generate_privacy_policy(client, description, cache) if privacy_policy else skip(),
+        create_story(client, task, story_prompt, cache, similar) if story_prompt else skip(),
+        return_exceptions=True,
+    )
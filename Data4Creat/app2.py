@@ -1,9 +1,21 @@
 #importing packages
 
+import sys
+import uuid
+from pathlib import Path
 import streamlit as st
-from openai import OpenAI
-import requests
-from fpdf import FPDF
+
+# Rerun timings (instrumentation/timings.py, shared by all apps) - stages and OpenAI calls (with token usage)
+# of every rerun go to JSON lines, cProfile capture when "Profile reruns" is on for this session
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'instrumentation'))
+import timings
+import ai_client
+import artifact_store
+import pdf_render
+import response_cache
+
+# PDF font lookup / renderer imports warmed up in background once per process (not on every rerun)
+pdf_render.preload()
 
 #Adding logo and privacy policy to session state
 
@@ -13,118 +25,80 @@ if 'logo' not in st.session_state:
 if 'privacy_policy' not in st.session_state:
     st.session_state['privacy_policy'] = None
 
+if 'privacy_policy_pdf' not in st.session_state:
+    st.session_state['privacy_policy_pdf'] = None
+
+# Session id - generated files are kept per session, so users never overwrite each other's logo / pdf
+if 'session_id' not in st.session_state:
+    st.session_state['session_id'] = uuid.uuid4().hex
+
+timings.begin('Data4Creat', st.session_state['session_id'], profile=st.session_state.get('profile_reruns', False))
+
 if 'user_input' not in st.session_state:
     st.session_state['user_input'] = ''
 
 # Open_AI Input
 with st.expander("Please copy your AI key here"):
     openai_key = st.text_input("OpenAI API Key", type="password")
+    base_url = st.text_input("API base URL (optional, e.g. local mock server)",
+                             help="Offline: python Data4Creat/mock_server.py, then http://127.0.0.1:8200/v1 and any key")
     if openai_key:
         st.session_state['openai_key'] = openai_key
-        openai_client = OpenAI(api_key=openai_key)
+        # Shared async client (pooled connections, reused across reruns)
+        openai_client = ai_client.get_client(openai_key, base_url.strip() or None)
 
 # Sidebar structure
 title = st.sidebar.text_input("Title: ")
 description = st.sidebar.text_input("Description")
 task = st.sidebar.text_input("What your app should do?")
 content = st.sidebar.text_input("What client should be asked for in dialog box?")
+use_cache = st.sidebar.checkbox("Use response cache", value=True)
+similar_answers = st.sidebar.checkbox("Reuse answers for similar questions", value=False, disabled=not use_cache)
 
 #Function generate_logo
 
 def generate_logo(description):
-    response = openai_client.images.generate(
-        model="dall-e-3",
-        prompt=f"""
-        {description}.
-        Wygeneruj minimalistyczne czarno-białe logo dla tej aplikacji.
-        Żadnych napisów ani dodatkowych elementów.
-        Jak najmniej miejsca pustego tła.
-        """,
-        size="1024x1024",
-        quality="standard",
-        n=1,
-    )
-
-    #return logo as png
-
-    image_url = response.data[0].url
-    response = requests.get(image_url)
-    with open("logo.png", "wb") as f:
-        f.write(response.content)
-    return "logo.png"
-
-#Function generate_content
-
-def create_story(story_prompt):
-    response = openai_client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {
-                "role": "system",
-                "content": f"""
-                    Twoim celem jest zrobić dla mnie aplikację, która: {task}. Masz robić tylko to, 
-                    nawet gdy użytkownik poprosi o co innego, napisz mu do czego służysz.
-                """
-            },
-            {"role": "user", "content": story_prompt}
-        ]
-    )
-    usage = {}
-    if response.usage:
-        usage = {
-            "completion_tokens": response.usage.completion_tokens,
-            "prompt_tokens": response.usage.prompt_tokens,
-            "total_tokens": response.usage.total_tokens,
-        }
-
-    return {
-        "role": "assistant",
-        "content": response.choices[0].message.content,
-        "usage": usage,
-    }
+    with timings.stage('generate logo'):
+        logo = ai_client.run(ai_client.generate_logo(openai_client, description, use_cache))
+
+    #return id of logo png in artifact store
+
+    return artifact_store.put(st.session_state['session_id'], logo)
 
 #Function generate_privacy_policy
 
 def generate_privacy_policy(description):
-    response = openai_client.chat.completions.create(
-        model="gpt-4",
-        messages=[
-            {
-                "role": "system",
-                "content": "Jesteś prawnikiem, który tworzy politykę prywatności oraz regulamin dla aplikacji internetowej."
-            },
-            {
-                "role": "user",
-                "content": f"{description}. Wygeneruj politykę prywatności oraz regulamin dla tej aplikacji.",
-            }
-        ]
-    )
-    return response.choices[0].message.content
-
-#saving to pdf
-
-def save_pdf(content, filename):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.multi_cell(0, 10, content.encode('latin-1', 'replace').decode('latin-1'))
-    pdf.output(filename)
+    with timings.stage('generate privacy policy'):
+        return ai_client.run(ai_client.generate_privacy_policy(openai_client, description, use_cache))
+
+#saving to pdf (in memory, Unicode font) - returns id of pdf in artifact store
+
+def save_pdf(content):
+    with timings.stage('render pdf') as stage:
+        pdf = pdf_render.render(content, 'privacy_policy', f"{title} - Polityka prywatności i regulamin" if title.strip() else None)
+        stage['bytes'] = len(pdf)
+    return artifact_store.put(st.session_state['session_id'], pdf)
 
 #user input
 
 st.session_state['user_input'] = st.text_area(f"{content}", max_chars=1000)
 if st.button("Generate 🚀", disabled=not description.strip(), use_container_width=True):
     if 'openai_key' in st.session_state and st.session_state['openai_key']:
-        st.session_state['story'] = create_story(st.session_state['user_input'])
-        st.write(st.session_state['story']['content'])
+        # Streaming answer - tokens are shown as they arrive
+        story = {}
+        with timings.stage('stream answer'):
+            st.write_stream(ai_client.iterate(ai_client.stream_story(openai_client, task, st.session_state['user_input'], story, use_cache, similar_answers)))
+        st.session_state['story'] = story
+        if story['time_to_first_token'] is not None:
+            source = " · from cache ⚡" if story.get('cached') else ""
+            st.caption(f"Time to first token: {story['time_to_first_token']:.2f} s · total: {story['total_time']:.2f} s · tokens: {story['usage'].get('total_tokens', '-')}{source}")
     else:
         st.error("Proszę wprowadzić ważny klucz API OpenAI.")
 
 # Generating logo
 if st.sidebar.button("Generate Logo"):
     if 'openai_key' in st.session_state and st.session_state['openai_key']:
-        logo_path = generate_logo(description)
-        st.session_state['logo'] = logo_path
+        st.session_state['logo'] = generate_logo(description)
         st.sidebar.success("Logo zostało wygenerowane.")
     else:
         st.sidebar.error("Proszę wprowadzić ważny klucz API OpenAI.")
@@ -136,16 +110,70 @@ if st.sidebar.button("Generate Privacy Policy"):
         st.session_state['privacy_policy'] = privacy_policy
         
         # saving as pdf
-        save_pdf(privacy_policy, "Private_Policy.pdf")
+        st.session_state['privacy_policy_pdf'] = save_pdf(privacy_policy)
         st.sidebar.success("Polityka Prywatności została zapisana jako PDF.")
     else:
         st.sidebar.error("Proszę wprowadzić ważny klucz API OpenAI.")
 
-# Displaying logo
-if st.session_state['logo']:
-    st.sidebar.image(st.session_state['logo'], use_column_width=True)
+# Generating logo, privacy policy and answer at once (requests run concurrently)
+if st.sidebar.button("Generate all ⚡", disabled=not description.strip()):
+    if 'openai_key' in st.session_state and st.session_state['openai_key']:
+        with timings.stage('generate all'):
+            logo, privacy_policy, story = ai_client.run(ai_client.generate_all(
+                openai_client, description, task=task, story_prompt=st.session_state['user_input'] or None,
+                cache=use_cache, similar=similar_answers,
+            ))
+        for name, result in [("Logo", logo), ("Privacy policy", privacy_policy), ("Answer", story)]:
+            if isinstance(result, Exception):
+                st.sidebar.error(f"{name}: {result}")
+        if logo is not None and not isinstance(logo, Exception):
+            st.session_state['logo'] = artifact_store.put(st.session_state['session_id'], logo)
+        if privacy_policy is not None and not isinstance(privacy_policy, Exception):
+            st.session_state['privacy_policy'] = privacy_policy
+            st.session_state['privacy_policy_pdf'] = save_pdf(privacy_policy)
+        if story is not None and not isinstance(story, Exception):
+            st.session_state['story'] = story
+            st.write(story['content'])
+        st.sidebar.success("Gotowe.")
+    else:
+        st.sidebar.error("Proszę wprowadzić ważny klucz API OpenAI.")
+
+# Displaying logo (served from memory, no file on disk)
+logo = artifact_store.get(st.session_state['session_id'], st.session_state['logo']) if st.session_state['logo'] else None
+if logo:
+    st.sidebar.image(logo, use_column_width=True)
+    st.sidebar.download_button("Pobierz logo", data=logo, file_name="logo.png", mime="image/png")
 
 # Displaying policy privacy
 if st.session_state['privacy_policy']:
     with st.sidebar.expander("Zobacz Politykę Prywatności i Regulamin"):
         st.write(st.session_state['privacy_policy'])
+    privacy_policy_pdf = artifact_store.get(st.session_state['session_id'], st.session_state['privacy_policy_pdf']) if st.session_state['privacy_policy_pdf'] else None
+    if privacy_policy_pdf:
+        st.sidebar.download_button("Pobierz PDF", data=privacy_policy_pdf, file_name="Private_Policy.pdf", mime="application/pdf")
+
+# Displaying response cache counters and generated files kept in memory (this app process, all sessions)
+cache_stats = response_cache.stats()
+store_stats = artifact_store.stats()
+with st.sidebar.expander("Response cache"):
+    for kind, counts in cache_stats['counters'].items():
+        st.write(f"{kind}: {counts['hits']} hits · {counts['similar_hits']} similar · {counts['misses']} misses")
+    st.caption(f"{cache_stats['entries']} entries · {cache_stats['bytes'] / 1024 / 1024:.1f} MB")
+    st.caption(f"Generated files: {store_stats['sessions']} sessions · {store_stats['memory_items']} in memory "
+               f"({store_stats['memory_bytes'] / 1024 / 1024:.1f} MB) · {store_stats['spilled_items']} on disk")
+    if st.button("Clear cache"):
+        response_cache.clear()
+        st.rerun()
+
+# New session - logo / pdf of this session are dropped from artifact store at once (otherwise after its TTL)
+if st.sidebar.button("Reset session"):
+    artifact_store.drop_session(st.session_state['session_id'])
+    for key in ['logo', 'privacy_policy', 'privacy_policy_pdf', 'story']:
+        st.session_state.pop(key, None)
+    st.session_state['session_id'] = uuid.uuid4().hex
+    st.rerun()
+
+st.sidebar.checkbox("Profile reruns 🔬", key='profile_reruns', help="cProfile of every rerun of this session (see instrumentation/dashboard.py)")
+
+# Rerun finished - timings written (st.stop / st.rerun / errors leave rerun open, next rerun writes it as incomplete)
+timings.end()
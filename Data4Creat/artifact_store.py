@@ -0,0 +1,107 @@
+#Imports
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+# Artifact store - generated files (logo png, privacy policy pdf) kept as bytes per session,
+# keyed by content hash; least recently used ones spill to disk when memory limit is reached,
+# sessions not used for SESSION_TTL_HOURS are dropped (Streamlit has no session end event)
+MAX_BYTES = int(os.environ.get('ARTIFACT_STORE_MB', 64)) * 1024 * 1024
+SPILL_DIR = Path(os.environ.get('ARTIFACT_SPILL_DIR', Path(__file__).with_name('cache') / 'artifacts'))
+SPILL_MAX_BYTES = int(os.environ.get('ARTIFACT_SPILL_MB', 512)) * 1024 * 1024
+SESSION_TTL = float(os.environ.get('ARTIFACT_SESSION_TTL_HOURS', 6)) * 3600
+
+_memory = OrderedDict()
+_spilled = OrderedDict()
+_last_used = {}
+_memory_bytes = 0
+_spilled_bytes = 0
+_lock = threading.Lock()
+
+def _spill_path(key):
+    session_id, digest = key
+    return SPILL_DIR / f'{session_id}-{digest}'
+
+# Function to move least recently used artifacts to disk (or drop them, ARTIFACT_SPILL_MB=0)
+def _evict():
+    global _memory_bytes, _spilled_bytes
+    while _memory_bytes > MAX_BYTES and len(_memory) > 1:
+        key, data = _memory.popitem(last=False)
+        _memory_bytes -= len(data)
+        if len(data) > SPILL_MAX_BYTES:
+            continue
+        SPILL_DIR.mkdir(parents=True, exist_ok=True)
+        _spill_path(key).write_bytes(data)
+        _spilled[key] = len(data)
+        _spilled_bytes += len(data)
+    while _spilled_bytes > SPILL_MAX_BYTES:
+        key, size = _spilled.popitem(last=False)
+        _spill_path(key).unlink(missing_ok=True)
+        _spilled_bytes -= size
+
+# Function to store artifact of session - returns its id (content hash, same bytes stored once)
+def put(session_id, data):
+    global _memory_bytes
+    data = bytes(data)
+    key = (session_id, hashlib.sha256(data).hexdigest()[:32])
+    with _lock:
+        _last_used[session_id] = time.monotonic()
+        if key in _memory:
+            _memory.move_to_end(key)
+        else:
+            _memory[key] = data
+            _memory_bytes += len(data)
+            _evict()
+    drop_idle_sessions()
+    return key[1]
+
+# Function to read artifact of session - None when it was never stored or already dropped
+def get(session_id, artifact_id):
+    global _memory_bytes, _spilled_bytes
+    key = (session_id, artifact_id)
+    with _lock:
+        _last_used[session_id] = time.monotonic()
+        if key in _memory:
+            _memory.move_to_end(key)
+            return _memory[key]
+        if key not in _spilled:
+            return None
+        # read back from disk, artifact becomes most recently used again
+        _spilled_bytes -= _spilled.pop(key)
+        path = _spill_path(key)
+        data = path.read_bytes()
+        path.unlink(missing_ok=True)
+        _memory[key] = data
+        _memory_bytes += len(data)
+        _evict()
+        return data
+
+# Function to drop all artifacts of session
+def drop_session(session_id):
+    global _memory_bytes, _spilled_bytes
+    with _lock:
+        _last_used.pop(session_id, None)
+        for key in [key for key in _memory if key[0] == session_id]:
+            _memory_bytes -= len(_memory.pop(key))
+        for key in [key for key in _spilled if key[0] == session_id]:
+            _spilled_bytes -= _spilled.pop(key)
+            _spill_path(key).unlink(missing_ok=True)
+
+# Function to drop artifacts of sessions not used for `ttl` seconds - returns their ids
+def drop_idle_sessions(ttl=SESSION_TTL):
+    now = time.monotonic()
+    with _lock:
+        idle = [session_id for session_id, used in _last_used.items() if now - used > ttl]
+    for session_id in idle:
+        drop_session(session_id)
+    return idle
+
+# Function to read store size
+def stats():
+    with _lock:
+        return {'sessions': len(_last_used), 'memory_items': len(_memory), 'memory_bytes': _memory_bytes,
+                'spilled_items': len(_spilled), 'spilled_bytes': _spilled_bytes}
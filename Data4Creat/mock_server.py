@@ -0,0 +1,146 @@
+#Imports
+
+import argparse
+import json
+import re
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local OpenAI mock for Data4Creat - chat completions (plain and streamed, with usage), image generation
+# and download of generated logo, optional latency and failures (HTTP 429 on API calls, 503 on downloads),
+# so the app runs without API key or network: base URL http://127.0.0.1:8200/v1, any key
+ANSWER = """# Polityka prywatności
+
+Administratorem danych osobowych jest właściciel aplikacji „{title}”.
+Dane są przetwarzane wyłącznie w celu świadczenia usługi.
+
+**Prawa użytkownika**
+1. Prawo dostępu do danych i ich sprostowania.
+2. Prawo do usunięcia danych („prawo do bycia zapomnianym”).
+- Kontakt: kontakt@example.pl
+
+Zażółć gęślą jaźń - odpowiedź testowa serwera mock."""
+
+# Function to build PNG logo (black ring on white background, grayscale) without image libraries
+def logo_png(size=256):
+    center, outer, inner = (size - 1) / 2, size * 0.4, size * 0.28
+    rows = b''.join(
+        b'\x00' + bytes(0 if inner <= ((x - center) ** 2 + (y - center) ** 2) ** 0.5 <= outer else 255 for x in range(size))
+        for y in range(size)
+    )
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', size, size, 8, 0, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b''))
+
+# Function to build chat answer for request (last user message is quoted, so answers differ per prompt)
+def answer(request):
+    prompt = str(request['messages'][-1]['content']) if request.get('messages') else ''
+    return ANSWER.format(title=prompt.strip().split('.')[0][:60] or 'Aplikacja')
+
+def make_handler(latency, rate_limit_every, fail_downloads_every):
+    counter = {'requests': 0, 'downloads': 0}
+    lock = threading.Lock()
+    logo = logo_png()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, content_type='application/json', headers=None):
+            data = json.dumps(body).encode('utf-8') if content_type == 'application/json' else body
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path != '/logo.png':
+                self._send(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+                return
+            with lock:
+                counter['downloads'] += 1
+                failed = fail_downloads_every and counter['downloads'] % fail_downloads_every == 0
+            if failed:
+                self._send(503, b'Service Unavailable', 'text/plain', {'retry-after': '0.2'})
+                return
+            self._send(200, logo, 'image/png')
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            with lock:
+                counter['requests'] += 1
+                limited = rate_limit_every and counter['requests'] % rate_limit_every == 0
+            if limited:
+                self._send(429, {"error": {"message": "Rate limit reached", "type": "requests"}}, headers={'retry-after': '0.2'})
+                return
+            time.sleep(latency)
+            if self.path.endswith('/images/generations'):
+                url = f"http://{self.headers['Host']}/logo.png"
+                self._send(200, {"created": int(time.time()), "data": [{"url": url, "revised_prompt": request.get("prompt")}]})
+            elif self.path.endswith('/chat/completions'):
+                self._chat(request)
+            else:
+                self._send(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+
+        def _chat(self, request):
+            content = answer(request)
+            model = request.get("model", "gpt-4")
+            usage = {"prompt_tokens": 100, "completion_tokens": len(content.split()), "total_tokens": 100 + len(content.split())}
+            if not request.get('stream'):
+                self._send(200, {
+                    "id": "chatcmpl-mock", "object": "chat.completion", "created": int(time.time()), "model": model,
+                    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+                    "usage": usage,
+                })
+                return
+            # streamed answer - one chunk per word (server-sent events), usage in last chunk
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            chunks = [{"choices": [{"index": 0, "delta": {"content": word}, "finish_reason": None}]}
+                      for word in re.findall(r'\s*\S+', content)]
+            if (request.get('stream_options') or {}).get('include_usage'):
+                chunks.append({"choices": [], "usage": usage})
+            for chunk in chunks:
+                event = {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": int(time.time()), "model": model, **chunk}
+                self._write_chunk(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+                time.sleep(latency / len(chunks))
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b'')
+
+        def _write_chunk(self, data):
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+            self.wfile.flush()
+
+    return Handler
+
+# Function to start mock in background thread - returns server (server.server_port, server.shutdown())
+def start(port=0, latency=0.2, rate_limit_every=0, fail_downloads_every=0):
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(latency, rate_limit_every, fail_downloads_every))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# Standalone: python mock_server.py --port 8200, then in app2 "API base URL" http://127.0.0.1:8200/v1 and any key
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local OpenAI mock for Data4Creat (chat, images, logo download)")
+    parser.add_argument('--port', type=int, default=8200)
+    parser.add_argument('--latency', type=float, default=0.2, help="seconds per answer")
+    parser.add_argument('--rate-limit-every', type=int, default=0, help="every N-th API request gets HTTP 429")
+    parser.add_argument('--fail-downloads-every', type=int, default=0, help="every N-th logo download gets HTTP 503")
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(('127.0.0.1', args.port),
+                                 make_handler(args.latency, args.rate_limit_every, args.fail_downloads_every))
+    print(f"Mock listening on http://127.0.0.1:{args.port}/v1")
+    server.serve_forever()
@@ -0,0 +1,185 @@
+#Imports
+
+import functools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from fpdf import FPDF
+
+# PDF rendering - generated documents (privacy policy, regulations) rendered in memory with Unicode
+# TTF font (Polish letters) - DejaVu Sans shipped in fonts/ (license in fonts/LICENSE), core Helvetica
+# with transliteration only when no TTF font is found (warning in log)
+FONT_CANDIDATES = [
+    os.environ.get('PDF_FONT_PATH'),
+    Path(__file__).with_name('fonts') / 'DejaVuSans.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/dejavu/DejaVuSans.ttf',
+    '/usr/share/fonts/TTF/DejaVuSans.ttf',
+    '/Library/Fonts/Arial Unicode.ttf',
+    'C:/Windows/Fonts/arial.ttf',
+]
+BOLD_NAMES = {'DejaVuSans.ttf': 'DejaVuSans-Bold.ttf', 'arial.ttf': 'arialbd.ttf'}
+
+TEMPLATES = {
+    'privacy_policy': {'title': 'Polityka prywatności i regulamin', 'font_size': 11, 'heading_size': 13,
+                       'title_size': 18, 'line_height': 5.5, 'paragraph_gap': 2.5, 'margin': 20},
+    'regulations': {'title': 'Regulamin', 'font_size': 11, 'heading_size': 13,
+                    'title_size': 18, 'line_height': 5.5, 'paragraph_gap': 2.5, 'margin': 20},
+    'document': {'title': None, 'font_size': 11, 'heading_size': 13,
+                 'title_size': 16, 'line_height': 5.5, 'paragraph_gap': 2.5, 'margin': 15},
+}
+LIST_ITEM = re.compile(r'^\s*(\d+[.)]|[-•*])\s')
+TRANSLITERATION = str.maketrans({'ł': 'l', 'Ł': 'L', '—': '-', '–': '-', '„': '"', '”': '"', '’': "'"})
+
+# Function to find Unicode font once per process - returns (regular, bold) paths or None
+@functools.lru_cache(maxsize=1)
+def find_font():
+    for path in FONT_CANDIDATES:
+        if path and Path(path).is_file():
+            bold = Path(path).with_name(BOLD_NAMES.get(Path(path).name, ''))
+            return str(path), str(bold) if bold.name and bold.is_file() else str(path)
+    logging.getLogger(__name__).warning(
+        "No Unicode TTF font found (fonts/DejaVuSans.ttf missing, PDF_FONT_PATH not set) - PDFs are rendered "
+        "with core Helvetica, Polish letters lose their diacritics.")
+    return None
+
+# Function to make text printable with core font (latin-1) - Polish letters lose accents, not whole letters
+def _to_latin1(text):
+    text = unicodedata.normalize('NFKD', text.translate(TRANSLITERATION))
+    return ''.join(char for char in text if not unicodedata.combining(char)).encode('latin-1', 'replace').decode('latin-1')
+
+# Function to split generated text into (kind, text) blocks - '#' lines and '**bold**' lines are headings,
+# numbered / bulleted lines start list item blocks; single line breaks inside block are kept ('\n')
+def _blocks(content):
+    kind, lines = 'text', []
+    for line in content.replace('\r\n', '\n').split('\n'):
+        stripped = line.strip()
+        heading = re.fullmatch(r'#+\s*(.+)|\*\*(.+?)\*\*:?', stripped)
+        item = LIST_ITEM.match(line)
+        if heading or item or not stripped:
+            if lines:
+                yield kind, '\n'.join(lines)
+            kind, lines = 'text', []
+            if heading:
+                yield 'heading', heading.group(1) or heading.group(2)
+                continue
+            if item:
+                kind = 'item'
+        if stripped:
+            lines.append(stripped.replace('**', ''))
+    if lines:
+        yield kind, '\n'.join(lines)
+
+# Function to break paragraph into lines of given width (greedy word wrap, word widths measured once -
+# many times faster than multi_cell line breaking on long documents)
+def _wrap(pdf, text, width, widths):
+    def measure(word):
+        if word not in widths:
+            widths[word] = pdf.get_string_width(word)
+        return widths[word]
+
+    space = measure(' ')
+    line, line_width = [], 0.0
+    for word in text.split():
+        word_width = measure(word)
+        while word_width > width:
+            # word longer than line - split by characters
+            cut = max(1, int(len(word) * width / word_width))
+            if line:
+                yield ' '.join(line)
+                line, line_width = [], 0.0
+            yield word[:cut]
+            word = word[cut:]
+            word_width = measure(word)
+        if line and line_width + space + word_width > width:
+            yield ' '.join(line)
+            line, line_width = [word], word_width
+        else:
+            line_width = line_width + space + word_width if line else word_width
+            line.append(word)
+    if line:
+        yield ' '.join(line)
+
+# Function to render document to PDF bytes (same content rendered once, later calls come from cache)
+@functools.lru_cache(maxsize=32)
+def render(content, template='privacy_policy', title=None):
+    settings = TEMPLATES[template]
+    title = title or settings['title']
+    font = find_font()
+    text = (lambda value: value) if font else _to_latin1
+
+    pdf = FPDF()
+    pdf.set_margins(settings['margin'], settings['margin'])
+    pdf.set_auto_page_break(True, settings['margin'])
+    if font:
+        pdf.add_font('Document', '', font[0])
+        pdf.add_font('Document', 'B', font[1])
+        family = 'Document'
+    else:
+        family = 'helvetica'
+    pdf.add_page()
+    widths = {}
+    if title:
+        pdf.set_font(family, 'B', settings['title_size'])
+        for line in _wrap(pdf, text(title), pdf.epw, widths):
+            pdf.cell(0, settings['title_size'] * 0.5, line, new_x='LMARGIN', new_y='NEXT')
+        pdf.ln(settings['paragraph_gap'] * 2)
+    for kind, block in _blocks(content):
+        if kind == 'heading':
+            pdf.set_font(family, 'B', settings['heading_size'])
+            pdf.ln(settings['paragraph_gap'])
+            size = settings['heading_size']
+        else:
+            pdf.set_font(family, '', settings['font_size'])
+            size = settings['font_size']
+        # widths of words depend on font style and size
+        style_widths = widths.setdefault((kind == 'heading', size), {})
+        for source_line in text(block).split('\n'):
+            for line in _wrap(pdf, source_line, pdf.epw, style_widths):
+                pdf.cell(0, settings['line_height'] * size / settings['font_size'], line, new_x='LMARGIN', new_y='NEXT')
+        # list items follow each other closer than paragraphs
+        pdf.ln(settings['paragraph_gap'] / 2 if kind == 'item' else settings['paragraph_gap'])
+    return bytes(pdf.output())
+
+# Function to warm up renderer in background once per process - font file lookup and fpdf / fontTools
+# imports; the TTF itself is parsed by every uncached render (about 40 ms), because fpdf2 subsets
+# parsed font in place when writing PDF, so one parsed font cannot be shared by documents
+_preloaded = threading.Event()
+
+def preload():
+    if _preloaded.is_set():
+        return
+    _preloaded.set()
+    threading.Thread(target=render, args=('Zażółć gęślą jaźń.', 'document', 'Preload'), daemon=True).start()
+
+# Benchmark: python pdf_render.py [paragraphs]
+if __name__ == '__main__':
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    section = ("Administratorem danych osobowych użytkowników aplikacji jest właściciel serwisu. "
+               "Dane są przetwarzane zgodnie z RODO, w celu świadczenia usług, obsługi zgłoszeń "
+               "i prowadzenia rozliczeń; użytkownik może żądać ich sprostowania lub usunięcia. ") * 6
+    document = '\n\n'.join(f"## §{i + 1}. Postanowienia\n{section}" for i in range(paragraphs))
+    print(f"Font: {find_font() or 'core helvetica (no TTF found)'}")
+
+    started = time.perf_counter()
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("helvetica", size=12)
+    pdf.multi_cell(0, 10, document.encode('latin-1', 'replace').decode('latin-1'))
+    reference = pdf.output()
+    print(f"core font + multi_cell (old): {time.perf_counter() - started:.3f} s, {pdf.page_no()} pages, {len(reference)} bytes")
+
+    for label in ('first render', 'second render (same text, cached)'):
+        started = time.perf_counter()
+        data = render(document)
+        pages = len(re.findall(rb'/Type /Page\b', data))
+        print(f"{label}: {time.perf_counter() - started:.3f} s, {pages} pages, {len(data)} bytes")
+    render.cache_clear()
+    started = time.perf_counter()
+    render(document + ' ')
+    print(f"warm render of new text: {time.perf_counter() - started:.3f} s")
@@ -0,0 +1,134 @@
+#Imports
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Response cache - API answers (logo bytes, privacy policies, chat answers) stored in SQLite,
+# keyed by model, prompt text and parameters, shared by all sessions and app restarts
+CACHE_DIR = Path(__file__).with_name('cache')
+DB_PATH = CACHE_DIR / 'responses.db'
+TTL_SECONDS = float(os.environ.get('RESPONSE_CACHE_TTL_HOURS', 24 * 7)) * 3600
+MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MB', 256)) * 1024 * 1024
+SIMILARITY = 0.85
+SIMILAR_CANDIDATES = 500
+
+_counters = {}
+_lock = threading.Lock()
+
+@contextmanager
+def _connect():
+    CACHE_DIR.mkdir(exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            kind TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            prompt TEXT NOT NULL,
+            value BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            created REAL NOT NULL,
+            last_used REAL NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS responses_scope ON responses (kind, scope, last_used)")
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def _digest(obj):
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+# Function to compute cache key - every request parameter (model, messages / prompt, size, ...) counts
+def cache_key(kind, request):
+    return _digest({'kind': kind, 'request': request})
+
+# Function to count cache lookup result ('hits', 'similar_hits' or 'misses') per kind
+def record(kind, event):
+    with _lock:
+        counts = _counters.setdefault(kind, {'hits': 0, 'similar_hits': 0, 'misses': 0})
+        counts[event] += 1
+
+# Function to read cached value - returns bytes or None (expired entries are deleted)
+def get(key):
+    now = time.time()
+    with _connect() as conn:
+        row = conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row and now - row[1] > TTL_SECONDS:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            row = None
+        if row:
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+    return row[0] if row else None
+
+# Function to save value (bytes) - scope groups entries that may be compared by find_similar
+def put(key, kind, value, prompt='', scope=''):
+    now = time.time()
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, kind, scope, prompt, value, size, created, last_used) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (key, kind, scope, prompt, value, len(value), now, now),
+        )
+        _evict(conn, now)
+
+# Function to drop expired entries, then least recently used ones until cache fits in MAX_BYTES
+def _evict(conn, now):
+    conn.execute("DELETE FROM responses WHERE created < ?", (now - TTL_SECONDS,))
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+        if total <= MAX_BYTES:
+            break
+        conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        total -= size
+
+# Function to normalize prompt (case, punctuation and whitespace do not change the question)
+def _normalize(text):
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text.lower()).split())
+
+def _trigrams(text):
+    text = f'  {text} '
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# Function to find near-duplicate prompt in the same scope (character trigram Jaccard similarity)
+# - returns cached value of most similar prompt or None
+def find_similar(kind, scope, prompt, threshold=SIMILARITY):
+    wanted = _trigrams(_normalize(prompt))
+    best, best_score = None, threshold
+    now = time.time()
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT key, prompt, value FROM responses WHERE kind = ? AND scope = ? AND created >= ? "
+            "ORDER BY last_used DESC LIMIT ?",
+            (kind, scope, now - TTL_SECONDS, SIMILAR_CANDIDATES),
+        ).fetchall()
+        for key, cached_prompt, value in rows:
+            candidate = _trigrams(_normalize(cached_prompt))
+            score = len(wanted & candidate) / len(wanted | candidate)
+            if score >= best_score:
+                best, best_score = (key, value), score
+        if best:
+            conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, best[0]))
+    return best[1] if best else None
+
+# Function to read hit / miss counters of this process and cache size
+def stats():
+    with _connect() as conn:
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+    with _lock:
+        counters = {kind: dict(counts) for kind, counts in _counters.items()}
+    return {'counters': counters, 'entries': entries, 'bytes': size}
+
+# Function to clear whole cache
+def clear():
+    with _connect() as conn:
+        conn.execute("DELETE FROM responses")
@@ -1,59 +1,52 @@
 #Imports
 
 import streamlit as st
-from pycaret.classification import setup, compare_models, predict_model, pull
-from pycaret.datasets import get_data
 import pandas as pd
-from faker import Faker
-import random
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from bulk_predict import INFERENCE_URL, coerce_to_schema, predict_labels, predict_remote, score_file, training_schema
+from dataset_store import custom_key, ensure_pycaret_dataset, get_overview, ingest, load_dataset
+from fake_data import generate_fake_data_fast
+from job_queue import ACTIVE, cancel, ensure_workers, get_job, load_inputs, load_progress, load_results, submit
+from training_engine import model_label
 
-fake = Faker()
+# Rerun timings (instrumentation/timings.py, shared by all apps) - stages of every rerun go to JSON lines,
+# cProfile capture when "Profile reruns" is on for this session; training jobs are timed by job_queue
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'instrumentation'))
+import timings
 
-# 1. Creating logic and functions of application
+if 'session_id' not in st.session_state:
+    st.session_state['session_id'] = uuid.uuid4().hex
+timings.begin('Data4Predicts', st.session_state['session_id'], profile=st.session_state.get('profile_reruns', False))
 
-# Creating datasets for user (using faker)
-column_options = {
-    'Name': fake.name,
-    'Address': fake.address,
-    'Email': fake.email,
-    'Experience (years)': lambda: random.normalvariate(10, 2),
-    'Job': lambda: random.choice(['Engineer', 'Doctor', 'Teacher', 'Artist', 'Lawyer'])
-}
-
-# Function to generate salary based on experience (to make datasets more fit)
-def generate_salary(experience):
-    base_salary = 30000
-    experience_factor = 5000
-    return random.normalvariate(base_salary + experience_factor * experience, 10000)
-
-# Function to generate datasets for user
-def generate_fake_data(title, rows):
-    columns = list(column_options.keys())
-    data = {col: [column_options[col]() for _ in range(rows)] for col in columns}
-    if 'Experience (years)' in data:
-        data['Salary'] = [generate_salary(exp) for exp in data['Experience (years)']]
-    df = pd.DataFrame(data)
-    df.title = title
-    return df
+# 1. Creating logic and functions of application
 
 # Function to display datasets
 def display_dataset_overview(dataset_name):
-    if 'df' in st.session_state and dataset_name == st.session_state.df.title:
-        df = st.session_state.df
-        st.write(f"Overview of {df.title} dataset 👀")
-        st.write("Sample Data 👓")
-        st.write(df.head(10))
-        st.write("Data Description 👓")
-        st.write(df.describe())
-        return df
-    else:
-        dataset = get_data(dataset_name)
-        st.write(f"Overview of the {dataset_name} dataset 👀")
-        st.write("Sample Data 👓")
-        st.write(dataset.head(10))
-        st.write("Data Description 👓")
-        st.write(dataset.describe())
-        return dataset
+    try:
+        if 'custom_data_key' in st.session_state and dataset_name == st.session_state.custom_data_title:
+            key = st.session_state.custom_data_key
+        else:
+            key = ensure_pycaret_dataset(dataset_name)
+    except Exception as e:
+        st.error(f"Error: dataset {dataset_name} is not stored locally and could not be downloaded ({str(e)})")
+        return None
+    # Sample and description come from metadata stored at ingest
+    with timings.stage('dataset overview', dataset=dataset_name):
+        overview = get_overview(key)
+    st.write(f"Overview of the {overview['title']} dataset 👀")
+    st.write("Sample Data 👓")
+    st.write(overview['head'])
+    st.write("Data Description 👓")
+    st.write(overview['describe'])
+    with timings.stage('load dataset', dataset=dataset_name) as stage:
+        dataset = load_dataset(key)
+        stage['rows'] = len(dataset)
+    return dataset
 
 # Function to display model training parameters
 def display_model_parameters(dataset):
@@ -65,8 +58,8 @@ def display_model_parameters(dataset):
     target = st.selectbox('Select Target Feature 🚗', valid_columns)
     return target
 
-# Function to train models
-def train_models(dataset, target):
+# Function to train models - training runs in background job queue, returns job id
+def train_models(dataset, target, engine, params):
     if target not in dataset.columns:
         st.error("Error: Invalid target feature. Please select a valid target feature.")
         return None
@@ -75,31 +68,47 @@ def train_models(dataset, target):
     if dataset[target].dtype not in [object, 'category']:
         dataset[target] = dataset[target].astype('category')
     
-    # Print out a sample of the dataset and target unique values for verification
-    print("Dataset sample:\n", dataset.head())
-    print("Target unique values:", dataset[target].unique())
-
+    # Dataset size and target classes are saved with stage timing
     try:
-        setup(data=dataset, target=target, session_id=123)
-        best_models = compare_models(n_select=5)
-        return best_models
+        with timings.stage('submit training', engine=engine, rows=len(dataset), columns=dataset.shape[1],
+                           target=target, classes=int(dataset[target].nunique())):
+            return submit(dataset, target, engine, params)
     except Exception as e:
         st.error(f"Error: {str(e)}")
         return None
 
+# Function to display training job status (job keeps running when page is refreshed)
+def display_training_job(job_id):
+    job = get_job(job_id)
+    if job is None:
+        st.error(f"Training job {job_id} not found.")
+        return None
+    from_cache = job['status'] == 'done' and job['worker_pid'] is None
+    st.write(f"Training job `{job_id}`: **{job['status']}**" + (" (from model cache ⚡)" if from_cache else ""))
+    if job['status'] in ACTIVE:
+        if job['total']:
+            st.progress(min(job['completed'] / job['total'], 1.0), text=f"Evaluated {job['completed']} of {job['total']} folds")
+        progress = load_progress(job_id)
+        if progress is not None:
+            st.dataframe(progress)
+        if st.button("Cancel training ✋"):
+            cancel(job_id)
+    elif job['status'] == 'failed':
+        st.error(f"Error: {job['error']}")
+    return job
+
 # Function to display best models summary
-def display_models_summary(best_models):
+def display_models_summary(best_models, leaderboard):
     st.write("Model Champions 🎉")
-    results = pull()
-    st.dataframe(results)
-    model_options = [f"Model {i+1}: {str(model).split('(')[0]}" for i, model in enumerate(best_models)]
+    st.dataframe(leaderboard)
+    model_options = [f"Model {i+1}: {model_label(model)}" for i, model in enumerate(best_models)]
     if model_options:
         selected_model_name = st.selectbox("Select Your Champion ⚔", model_options)
         selected_model_index = model_options.index(selected_model_name)
-        return best_models[selected_model_index], selected_model_name
+        return best_models[selected_model_index], selected_model_name, selected_model_index
     else:
         st.warning("No models available. Please check your target feature and try again.")
-        return None, None
+        return None, None, None
 
 # Function to display data entry form
 def display_data_entry_form(dataset, target):
@@ -113,13 +122,49 @@ def display_data_entry_form(dataset, target):
         submit_button = st.form_submit_button(label='Submit Data ✔')
     return input_data, submit_button
 
-# Function to predict based on input data
-def make_prediction(model, input_data):
-    input_df = pd.DataFrame([input_data])
-    prediction = predict_model(model, data=input_df)
-    predicted_class = prediction["prediction_label"].values[0]
+# Function to predict based on input data - in inference service when INFERENCE_URL is set
+# (model of finished job hosted once for all sessions), locally otherwise (or when service is down)
+def make_prediction(model, input_data, schema, job_id=None, model_index=None):
+    if INFERENCE_URL and job_id is not None:
+        try:
+            with timings.call('inference service'):
+                return predict_remote(job_id, model_index, [input_data])[0]
+        except OSError as e:
+            st.caption(f"Inference service unavailable ({e}), predicted locally.")
+    with timings.stage('predict'):
+        input_df = coerce_to_schema(pd.DataFrame([input_data]), schema)
+        predicted_class = predict_labels(model, input_df)[0]
     return predicted_class
 
+# Function to score uploaded table in chunks - result is written to anonymous temporary file while scoring
+# (removed by the OS when closed - next scoring, end of session or crash - nothing is left in /tmp)
+def display_bulk_prediction(model, schema):
+    st.write("Bulk Prediction 📦")
+    uploaded_file = st.file_uploader("Upload CSV or Parquet file to score", type=['csv', 'parquet'])
+    if uploaded_file is not None and st.button("Score File 🏭"):
+        if st.session_state.get('bulk_result') is not None:
+            st.session_state.bulk_result.close()
+            st.session_state.bulk_result = None
+        output = tempfile.TemporaryFile('w+', encoding='utf-8', newline='')
+        progress = st.empty()
+        stats = None
+        try:
+            with timings.stage('bulk prediction') as stage:
+                for stats in score_file(model, uploaded_file, schema, output, filename=uploaded_file.name):
+                    progress.write(f"Scored **{stats['rows']:,}** rows ({stats['rows_per_sec']:,.0f} rows/sec)")
+                    stage['rows'] = stats['rows']
+            st.session_state.bulk_result = output
+            if stats is not None:
+                progress.success(f"Done: {stats['rows']:,} rows in {stats['seconds']:.2f} s ({stats['rows_per_sec']:,.0f} rows/sec)")
+        except Exception as e:
+            output.close()
+            st.error(f"Error: {str(e)}")
+
+    if st.session_state.get('bulk_result') is not None:
+        result_file = st.session_state.bulk_result
+        result_file.seek(0)
+        st.download_button("Download predictions.csv", data=result_file.read(), file_name="predictions.csv", mime="text/csv")
+
 # 2. Creating Main Application
 
 # Creating layout - Introduction
@@ -142,7 +187,10 @@ with st.expander("Generate your own data!📚"):
             rows = st.number_input('Number of rows', min_value=60, value=60)
             generate_button = st.form_submit_button(label='Add this data')
             if generate_button:
-                st.session_state.df = generate_fake_data(title, rows)
+                with timings.stage('generate data', rows=rows):
+                    df = generate_fake_data_fast(title, rows)
+                with timings.stage('store dataset'):
+                    st.session_state.custom_data_key = ingest(custom_key(df), df, title=title)
                 st.session_state.custom_data_generated = True
                 st.session_state.custom_data_title = title
                 st.success('Data added! ✨')
@@ -154,7 +202,14 @@ if 'custom_data_generated' in st.session_state and st.session_state.custom_data_
 else:
     dataset_name = st.selectbox('Select Dataset 🧺', ['iris', 'wine', 'titanic', 'juice'])
 if st.button("Select Dataset 🧭"):
-    st.session_state.dataset = display_dataset_overview(dataset_name)
+    dataset = display_dataset_overview(dataset_name)
+    if dataset is not None:
+        st.session_state.dataset = dataset
+
+# Re-attach training job after page refresh (job id is kept in page URL)
+if 'job_id' not in st.session_state and 'job' in st.query_params and get_job(st.query_params['job']):
+    st.session_state.job_id = st.query_params['job']
+    st.session_state.dataset, st.session_state.trained_target = load_inputs(st.session_state.job_id)
 
 # Step 2: Choose Model Parameters
 if 'dataset' in st.session_state:
@@ -163,22 +218,43 @@ if 'dataset' in st.session_state:
 
 # Train Model
 if 'target' in st.session_state and st.session_state.target is not None:
+    engine = st.radio("Training engine ⚙", ['PyCaret compare_models', 'Parallel search'], horizontal=True)
+    if engine == 'Parallel search':
+        time_budget = st.slider("Time budget (seconds) ⏱", min_value=10, max_value=600, value=60)
+        n_jobs = st.slider("CPU workers 🧮", min_value=1, max_value=max(os.cpu_count() or 1, 2), value=os.cpu_count() or 1)
     if st.button("Train Model 🚚"):
         st.session_state.train_model_clicked = True
-        with st.spinner("Please wait while the model is being trained..."):
-            st.session_state.best_models = train_models(st.session_state.dataset, st.session_state.target)
-        if st.session_state.best_models is not None:
-            st.success("Model training completed!")
+        if engine == 'Parallel search':
+            job_id = train_models(st.session_state.dataset, st.session_state.target, 'search', {'time_budget': time_budget, 'n_jobs': n_jobs})
+        else:
+            job_id = train_models(st.session_state.dataset, st.session_state.target, 'pycaret', {})
+        if job_id is not None:
+            st.session_state.job_id = job_id
+            st.session_state.trained_target = st.session_state.target
+            st.query_params['job'] = job_id
+            for key in ['best_models', 'leaderboard', 'selected_model', 'input_data']:
+                st.session_state.pop(key, None)
+
+# Training progress / results
+job = None
+if 'job_id' in st.session_state:
+    job = display_training_job(st.session_state.job_id)
+    if job is not None and job['status'] == 'done' and st.session_state.get('loaded_job') != job['id']:
+        with timings.stage('load trained models'):
+            st.session_state.best_models, st.session_state.leaderboard = load_results(job['id'])
+        st.session_state.loaded_job = job['id']
+        st.success("Model training completed!")
 
 # See Trained Model
 if 'best_models' in st.session_state and st.session_state.best_models is not None:
-    model, model_name = display_models_summary(st.session_state.best_models)
+    model, model_name, model_index = display_models_summary(st.session_state.best_models, st.session_state.leaderboard)
     st.session_state.selected_model = model
     st.session_state.selected_model_name = model_name
+    st.session_state.selected_model_index = model_index
 
 # Enter Data for Prediction
 if 'selected_model' in st.session_state:
-    input_data, submit_button = display_data_entry_form(st.session_state.dataset, st.session_state.target)
+    input_data, submit_button = display_data_entry_form(st.session_state.dataset, st.session_state.trained_target)
     if submit_button:
         st.session_state.input_data = input_data
 
@@ -186,12 +262,32 @@ if 'selected_model' in st.session_state:
 if 'input_data' in st.session_state:
     if st.button("Check Prediction 🔎"):
         st.session_state.check_prediction_clicked = True
-        predicted_class = make_prediction(st.session_state.selected_model, st.session_state.input_data)
+        schema = training_schema(st.session_state.dataset, st.session_state.trained_target)
+        predicted_class = make_prediction(st.session_state.selected_model, st.session_state.input_data, schema,
+                                          st.session_state.get('loaded_job'), st.session_state.get('selected_model_index'))
         st.write(f"#### Predicted Class: {predicted_class}")
 
+# Bulk Prediction
+if 'selected_model' in st.session_state and st.session_state.selected_model is not None:
+    display_bulk_prediction(st.session_state.selected_model, training_schema(st.session_state.dataset, st.session_state.trained_target))
+
 # Refresh Data Button
 if st.button("Double click to refresh 🌧"):
     for key in list(st.session_state.keys()):
         del st.session_state[key]
+    st.query_params.clear()
+
+st.sidebar.checkbox("Profile reruns 🔬", key='profile_reruns', help="cProfile of every rerun of this session (see instrumentation/dashboard.py)")
+
+# Rerun finished - timings written before polling sleep (st.stop / errors leave rerun open,
+# next rerun writes it as incomplete)
+timings.end()
+
+# Poll running training job - workers are (re)started when app process has none (e.g. after app restart,
+# they mark jobs of dead workers failed and take queued ones)
+if job is not None and job['status'] in ACTIVE:
+    ensure_workers()
+    time.sleep(2)
+    st.rerun()
 
 # Thank you for take a look on this 😎
\ No newline at end of file
@@ -0,0 +1,77 @@
+#Imports
+
+import json
+import os
+import time
+import urllib.request
+import numpy as np
+import pandas as pd
+from training_engine import is_search_model
+
+# Bulk prediction - uploaded table scored in chunks with selected champion model
+CHUNK_SIZE = 20_000
+# Inference service (inference_service/server.py) - when set, single predictions go there
+INFERENCE_URL = os.environ.get('INFERENCE_URL')
+INFERENCE_TIMEOUT = float(os.environ.get('INFERENCE_TIMEOUT', 10))
+
+# Function to read training schema (column -> dtype, without target)
+def training_schema(dataset, target):
+    return {col: dtype for col, dtype in dataset.dtypes.items() if col != target}
+
+# Function to cast uploaded / typed values to training dtypes (unparseable values become missing)
+def coerce_to_schema(df, schema):
+    coerced = pd.DataFrame(index=df.index)
+    for col, dtype in schema.items():
+        values = df[col] if col in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+        if pd.api.types.is_bool_dtype(dtype):
+            text = values.astype('string').str.strip().str.lower()
+            coerced[col] = text.map({'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False})
+        elif pd.api.types.is_numeric_dtype(dtype):
+            numbers = pd.to_numeric(values, errors='coerce')
+            coerced[col] = numbers.astype(dtype) if not numbers.isna().any() else numbers.astype('float64')
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            coerced[col] = pd.to_datetime(values, errors='coerce')
+        elif isinstance(dtype, pd.CategoricalDtype):
+            coerced[col] = pd.Categorical(values.astype('string').where(values.notna()), categories=dtype.categories)
+        else:
+            coerced[col] = values.where(values.isna(), values.astype(str))
+    return coerced
+
+# Function to predict labels for prepared rows (search pipelines or pycaret pipelines)
+def predict_labels(model, df):
+    if is_search_model(model):
+        return model.predict(df)
+    from pycaret.classification import predict_model
+    return predict_model(model, data=df, verbose=False)['prediction_label'].to_numpy()
+
+# Function to predict rows in inference service with model of finished training job (hosted once for all
+# sessions, requests micro-batched) - rows are raw values, service casts them to training schema;
+# raises OSError when service is not reachable
+def predict_remote(job_id, model_index, rows, url=INFERENCE_URL, timeout=INFERENCE_TIMEOUT):
+    request = urllib.request.Request(f"{url.rstrip('/')}/predict/job/{job_id}/{model_index}",
+                                     data=json.dumps({'rows': rows}, default=str).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())['labels']
+
+# Function to read CSV / Parquet upload chunk by chunk (CSV read as text, coerce_to_schema types it)
+def iter_chunks(source, filename=None, chunk_size=CHUNK_SIZE):
+    filename = filename or getattr(source, 'name', str(source))
+    if filename.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_size, dtype=str, keep_default_na=True)
+
+# Function to score file - writes CSV (uploaded columns + prediction_label) and yields throughput
+def score_file(model, source, schema, output, filename=None, chunk_size=CHUNK_SIZE):
+    rows = 0
+    started = time.perf_counter()
+    for i, chunk in enumerate(iter_chunks(source, filename, chunk_size)):
+        chunk = chunk.copy()
+        chunk['prediction_label'] = predict_labels(model, coerce_to_schema(chunk, schema))
+        chunk.to_csv(output, index=False, header=(i == 0))
+        rows += len(chunk)
+        elapsed = time.perf_counter() - started
+        yield {'rows': rows, 'seconds': elapsed, 'rows_per_sec': rows / elapsed if elapsed else 0.0}
@@ -0,0 +1,87 @@
+#Imports
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Local dataset store - Parquet files + metadata (head / describe computed once at ingest)
+STORE_DIR = Path(__file__).with_name('data_store')
+
+# Streamlit sessions are threads of one process - one ingest / download per dataset key at a time
+_locks = {}
+_locks_lock = threading.Lock()
+
+def _key_lock(key):
+    with _locks_lock:
+        return _locks.setdefault(key, threading.RLock())
+
+def _paths(key):
+    return STORE_DIR / f'{key}.parquet', STORE_DIR / f'{key}.json'
+
+# Function to build key for generated dataset (content hash - same title from two users never clashes)
+def custom_key(df):
+    digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=False).values.tobytes()).hexdigest()
+    return f"custom-{re.sub(r'[^A-Za-z0-9_-]+', '_', str(df.title))[:40]}-{digest[:12]}"
+
+def contains(key):
+    return all(path.exists() for path in _paths(key))
+
+# Function to write file atomically - unique temp file in store directory, then renamed
+def _write_atomic(path, write):
+    handle, tmp = tempfile.mkstemp(dir=STORE_DIR, prefix=f'{path.name}.', suffix='.tmp')
+    os.close(handle)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+# Function to store dataset - Parquet data and JSON metadata, both written atomically
+def ingest(key, df, title=None):
+    STORE_DIR.mkdir(exist_ok=True)
+    data_path, meta_path = _paths(key)
+    metadata = {
+        'title': title or key,
+        'rows': len(df),
+        'dtypes': {str(col): str(dtype) for col, dtype in df.dtypes.items()},
+        'head': df.head(10).to_json(orient='split', date_format='iso'),
+        'describe': df.describe().to_json(orient='split'),
+    }
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with _key_lock(key):
+        _write_atomic(data_path, lambda tmp: pq.write_table(table, tmp))
+        _write_atomic(meta_path, lambda tmp: Path(tmp).write_text(json.dumps(metadata), encoding='utf-8'))
+    return key
+
+# Function to read stored summaries without touching the data file
+def get_overview(key):
+    metadata = json.loads(_paths(key)[1].read_text(encoding='utf-8'))
+    metadata['head'] = pd.read_json(StringIO(metadata['head']), orient='split', dtype=False, convert_dates=False)
+    metadata['describe'] = pd.read_json(StringIO(metadata['describe']), orient='split')
+    return metadata
+
+# Function to load stored dataset (memory-mapped Parquet read)
+def load_dataset(key):
+    df = pq.read_table(_paths(key)[0], memory_map=True).to_pandas()
+    df.title = get_overview(key)['title']
+    return df
+
+# Function to make sure pycaret dataset is stored locally (network is used only for the first time)
+# (sessions opening the same dataset at once wait for the first download)
+def ensure_pycaret_dataset(name):
+    if contains(name):
+        return name
+    with _key_lock(name):
+        if not contains(name):
+            from pycaret.datasets import get_data
+            ingest(name, get_data(name, verbose=False), title=name)
+    return name
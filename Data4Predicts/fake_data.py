@@ -0,0 +1,95 @@
+#Imports
+
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from faker import Faker
+
+fake = Faker()
+
+# Creating datasets for user (using faker)
+column_options = {
+    'Name': fake.name,
+    'Address': fake.address,
+    'Email': fake.email,
+    'Experience (years)': lambda: random.normalvariate(10, 2),
+    'Job': lambda: random.choice(['Engineer', 'Doctor', 'Teacher', 'Artist', 'Lawyer'])
+}
+
+# Function to generate salary based on experience (to make datasets more fit)
+def generate_salary(experience):
+    base_salary = 30000
+    experience_factor = 5000
+    return random.normalvariate(base_salary + experience_factor * experience, 10000)
+
+# Function to generate datasets for user (one Faker call per cell - reference for benchmark)
+def generate_fake_data(title, rows):
+    columns = list(column_options.keys())
+    data = {col: [column_options[col]() for _ in range(rows)] for col in columns}
+    if 'Experience (years)' in data:
+        data['Salary'] = [generate_salary(exp) for exp in data['Experience (years)']]
+    df = pd.DataFrame(data)
+    df.title = title
+    return df
+
+# Vectorized generator - same columns and distributions as generate_fake_data
+JOBS = np.array(['Engineer', 'Doctor', 'Teacher', 'Artist', 'Lawyer'], dtype=object)
+POOL_SIZE = 2000
+CHUNK_SIZE = 250_000
+
+# Function to pre-sample string pools once (Faker is only called POOL_SIZE times per column)
+def _string_pools(seed, pool_size):
+    faker = Faker()
+    faker.seed_instance(seed)
+    return {
+        'Name': np.array([faker.name() for _ in range(pool_size)], dtype=object),
+        'Address': np.array([faker.address() for _ in range(pool_size)], dtype=object),
+        'Email': np.array([faker.email() for _ in range(pool_size)], dtype=object),
+    }
+
+# Function to generate one chunk - strings by index sampling, numbers with NumPy
+def _generate_chunk(rows, seed, pools):
+    rng = np.random.default_rng(seed)
+    data = {col: pool[rng.integers(0, len(pool), rows)] for col, pool in pools.items()}
+    experience = rng.normal(10, 2, rows)
+    data['Experience (years)'] = experience
+    data['Job'] = JOBS[rng.integers(0, len(JOBS), rows)]
+    data['Salary'] = rng.normal(30000 + 5000 * experience, 10000)
+    return pd.DataFrame(data)
+
+# Function to generate datasets fast - chunks get own seeds from SeedSequence,
+# so result depends only on seed and chunk_size (not on n_jobs)
+def generate_fake_data_fast(title, rows, seed=None, n_jobs=None, chunk_size=CHUNK_SIZE, pool_size=POOL_SIZE):
+    seed_sequence = np.random.SeedSequence(seed)
+    pools_seed, *chunk_seeds = seed_sequence.spawn(1 + max(1, -(-rows // chunk_size)))
+    pools = _string_pools(int(pools_seed.generate_state(1)[0]), pool_size)
+    sizes = [min(chunk_size, rows - start) for start in range(0, rows, chunk_size)] or [0]
+    if n_jobs is None:
+        n_jobs = min(len(sizes), os.cpu_count() or 1)
+
+    if n_jobs > 1:
+        # spawn - forking multi-threaded Streamlit server can deadlock
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context('spawn')) as executor:
+            chunks = list(executor.map(_generate_chunk, sizes, chunk_seeds, [pools] * len(sizes)))
+    else:
+        chunks = [_generate_chunk(size, chunk_seed, pools) for size, chunk_seed in zip(sizes, chunk_seeds)]
+
+    df = pd.concat(chunks, ignore_index=True)
+    df.title = title
+    return df
+
+# Benchmark - python fake_data.py
+if __name__ == '__main__':
+    for rows in (10_000, 100_000):
+        started = time.perf_counter()
+        generate_fake_data('benchmark', rows)
+        print(f"generate_fake_data      {rows:>9,} rows: {time.perf_counter() - started:7.2f} s")
+    for rows in (10_000, 100_000, 1_000_000):
+        for n_jobs in (1, None):
+            started = time.perf_counter()
+            generate_fake_data_fast('benchmark', rows, seed=123, n_jobs=n_jobs)
+            print(f"generate_fake_data_fast {rows:>9,} rows (n_jobs={n_jobs}): {time.perf_counter() - started:7.2f} s")
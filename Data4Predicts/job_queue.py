@@ -0,0 +1,281 @@
+#Imports
+
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+import joblib
+import pandas as pd
+import model_cache
+
+# Local training queue - jobs in SQLite, datasets / results on disk, worker processes run them
+JOBS_DIR = Path(__file__).with_name('jobs')
+DB_PATH = JOBS_DIR / 'jobs.db'
+WORKERS = int(os.environ.get('TRAINING_WORKERS', 2))
+POLL_SECONDS = 1.0
+ACTIVE = ('queued', 'running', 'cancelling')
+
+_workers = []
+_workers_lock = threading.Lock()
+
+# Function to open queue database (WAL - app and workers read/write at the same time)
+@contextmanager
+def _connect():
+    JOBS_DIR.mkdir(exist_ok=True)
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            engine TEXT NOT NULL,
+            target TEXT NOT NULL,
+            params TEXT NOT NULL,
+            created REAL NOT NULL,
+            started REAL,
+            finished REAL,
+            worker_pid INTEGER,
+            job_pid INTEGER,
+            completed INTEGER DEFAULT 0,
+            total INTEGER DEFAULT 0,
+            error TEXT,
+            cache_key TEXT
+        )
+    """)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def job_dir(job_id):
+    return JOBS_DIR / job_id
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except (OSError, TypeError):
+        return False
+    return True
+
+def _update(job_id, **fields):
+    with _connect() as conn:
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+# Function to write file atomically (app may read it while worker writes)
+def _dump(obj, path):
+    tmp = path.with_suffix('.tmp')
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
+
+# 1. Functions used by the app
+
+# Function to submit training - returns job id
+# Same dataset / target / params trained before -> job is done at once from model cache,
+# same training already queued or running -> its job id is returned
+def submit(dataset, target, engine='pycaret', params=None):
+    params = params or {}
+    key = model_cache.cache_key(dataset, target, engine, params)
+    with _connect() as conn:
+        running = conn.execute(
+            "SELECT id FROM jobs WHERE cache_key = ? AND status IN ('queued', 'running') ORDER BY created LIMIT 1", (key,)
+        ).fetchone()
+    if running:
+        return running['id']
+
+    job_id = uuid.uuid4().hex[:12]
+    job_dir(job_id).mkdir(parents=True)
+    dataset.to_pickle(job_dir(job_id) / 'dataset.pkl')
+    cached = model_cache.fetch(key, job_dir(job_id))
+    now = time.time()
+    with _connect() as conn:
+        conn.execute(
+            "INSERT INTO jobs (id, status, engine, target, params, created, started, finished, cache_key) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, 'done' if cached else 'queued', engine, target, json.dumps(params), now,
+             now if cached else None, now if cached else None, key),
+        )
+    if not cached:
+        ensure_workers()
+    return job_id
+
+# Function to get job row as dict (None for unknown id)
+def get_job(job_id):
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return dict(row) if row else None
+
+# Function to cancel job - queued jobs stop at once, running ones are killed by their worker
+def cancel(job_id):
+    with _connect() as conn:
+        conn.execute(
+            "UPDATE jobs SET status = CASE status WHEN 'queued' THEN 'cancelled' ELSE 'cancelling' END "
+            "WHERE id = ? AND status IN ('queued', 'running')",
+            (job_id,),
+        )
+
+# Function to read dataset and target of job (to re-attach it after page refresh)
+def load_inputs(job_id):
+    job = get_job(job_id)
+    return pd.read_pickle(job_dir(job_id) / 'dataset.pkl'), job['target']
+
+# Function to read leaderboard published while search is running
+def load_progress(job_id):
+    path = job_dir(job_id) / 'progress.pkl'
+    return joblib.load(path) if path.exists() else None
+
+# Function to read results of finished job - best models and leaderboard
+def load_results(job_id):
+    folder = job_dir(job_id)
+    model_paths = sorted(folder.glob('model_*.pkl'), key=lambda path: int(path.stem.split('_')[1]))
+    return [joblib.load(path) for path in model_paths], joblib.load(folder / 'leaderboard.pkl')
+
+# Function to start worker processes once per app process (restarts dead ones)
+def ensure_workers(count=WORKERS):
+    with _workers_lock:
+        _workers[:] = [worker for worker in _workers if worker.poll() is None]
+        while len(_workers) < count:
+            _workers.append(subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve()), '--parent-pid', str(os.getpid())],
+                cwd=Path(__file__).parent,
+            ))
+
+# 2. Worker side
+
+# Function to claim oldest queued job
+def _claim(conn):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1").fetchone()
+        if row:
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started = ?, worker_pid = ? WHERE id = ?",
+                (time.time(), os.getpid(), row['id']),
+            )
+        conn.execute("COMMIT")
+    except sqlite3.Error:
+        conn.execute("ROLLBACK")
+        raise
+    return row['id'] if row else None
+
+# Function to train with pycaret - models saved as full pipelines, so predict_model works without setup
+def _train_pycaret(job_id, dataset, target, params):
+    import timings
+    # pycaret log goes to job directory, not logs.log in working directory (pycaret opens it on import)
+    log_path = str(job_dir(job_id) / 'pycaret.log')
+    os.environ['PYCARET_CUSTOM_LOGGING_PATH'] = log_path
+    with timings.stage('import pycaret'):
+        from pycaret.classification import setup, compare_models, pull, save_model
+
+    with timings.stage('setup', rows=len(dataset), columns=dataset.shape[1]):
+        setup(data=dataset, target=target, session_id=123, verbose=False, html=False, system_log=log_path)
+    with timings.stage('compare_models'):
+        best_models = compare_models(n_select=params.get('n_select', 5), verbose=False)
+    if not isinstance(best_models, list):
+        best_models = [best_models]
+    leaderboard = pull()
+    with timings.stage('save models', models=len(best_models)):
+        for i, model in enumerate(best_models):
+            save_model(model, str(job_dir(job_id) / f'model_{i}'), verbose=False)
+        _dump(leaderboard, job_dir(job_id) / 'leaderboard.pkl')
+
+# Function to train with parallel search - leaderboard published after every fold
+def _train_search(job_id, dataset, target, params):
+    import timings
+    from training_engine import search_models
+
+    with timings.stage('search_models', rows=len(dataset), columns=dataset.shape[1]) as stage:
+        for event in search_models(dataset, target, **params):
+            _update(job_id, completed=event['completed'], total=event['total'])
+            _dump(event['leaderboard'], job_dir(job_id) / 'progress.pkl')
+        stage['folds'] = event['completed']
+    with timings.stage('save models', models=len(event['models'])):
+        for i, model in enumerate(event['models']):
+            _dump(model, job_dir(job_id) / f'model_{i}.pkl')
+        _dump(event['leaderboard'], job_dir(job_id) / 'leaderboard.pkl')
+
+TRAINERS = {'pycaret': _train_pycaret, 'search': _train_search}
+
+# Function to run one job (child process of worker, own process group - cancel kills its pool too)
+def _run_job(job_id):
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()
+    import timings
+    job = get_job(job_id)
+    # one timings record per job (setup / compare_models / saving), session = job id
+    timings.begin(f"Data4Predicts.{job['engine']}", job_id)
+    try:
+        with timings.stage('read dataset'):
+            dataset = pd.read_pickle(job_dir(job_id) / 'dataset.pkl')
+        TRAINERS[job['engine']](job_id, dataset, job['target'], json.loads(job['params']))
+        if job['cache_key']:
+            with timings.stage('store in model cache'):
+                model_cache.store(job['cache_key'], job_dir(job_id))
+        _update(job_id, status='done', finished=time.time())
+    except Exception:
+        _update(job_id, status='failed', finished=time.time(), error=traceback.format_exc(limit=3))
+    timings.end()
+
+def _kill(process):
+    if hasattr(os, 'killpg'):
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except OSError:
+            pass
+    process.terminate()
+    process.join()
+
+# Function to mark jobs of dead workers as failed (app or worker was restarted mid-training)
+def _recover_orphans(conn):
+    for row in conn.execute("SELECT id, worker_pid FROM jobs WHERE status IN ('running', 'cancelling')").fetchall():
+        if not _pid_alive(row['worker_pid']):
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', finished = ?, error = 'Worker stopped during training.' WHERE id = ?",
+                (time.time(), row['id']),
+            )
+
+# Worker loop - one job at a time, polls for cancel while job runs; jobs of workers that died
+# (killed, crashed) are marked failed by any other worker on its next poll
+def worker_loop(parent_pid=None):
+    context = multiprocessing.get_context('spawn')
+    while parent_pid is None or _pid_alive(parent_pid):
+        with _connect() as conn:
+            _recover_orphans(conn)
+            job_id = _claim(conn)
+        if job_id is None:
+            time.sleep(POLL_SECONDS)
+            continue
+
+        process = context.Process(target=_run_job, args=(job_id,))
+        process.start()
+        _update(job_id, job_pid=process.pid)
+        while process.is_alive():
+            process.join(POLL_SECONDS)
+            with _connect() as conn:
+                _recover_orphans(conn)
+            job = get_job(job_id)
+            if job['status'] == 'cancelling' or (parent_pid is not None and not _pid_alive(parent_pid)):
+                _kill(process)
+                _update(job_id, status='cancelled', finished=time.time())
+        if get_job(job_id)['status'] == 'running':
+            _update(job_id, status='failed', finished=time.time(), error=f"Training process exited with code {process.exitcode}.")
+
+# Standalone workers: python job_queue.py
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Data4Predicts training worker")
+    parser.add_argument('--parent-pid', type=int, default=None, help="exit when this process is gone")
+    args = parser.parse_args()
+    # shared rerun timings module (jobs started from this worker inherit the path)
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'instrumentation'))
+    worker_loop(args.parent_pid)
@@ -0,0 +1,90 @@
+#Imports
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+import pandas as pd
+
+# Trained models cache - leaderboard + best models per (dataset content, target, setup params)
+CACHE_DIR = Path(__file__).with_name('models_cache')
+INDEX_PATH = CACHE_DIR / 'index.db'
+MAX_BYTES = int(os.environ.get('MODEL_CACHE_MB', 2048)) * 1024 * 1024
+SETUP_PARAMS = {'session_id': 123}
+RESULT_FILES = ('leaderboard.pkl', 'model_*.pkl')
+
+@contextmanager
+def _connect():
+    CACHE_DIR.mkdir(exist_ok=True)
+    conn = sqlite3.connect(INDEX_PATH, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, size INTEGER NOT NULL, last_used REAL NOT NULL)")
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+# Function to compute cache key - content hash of dataset (values, columns, dtypes), target and params
+# (n_jobs only changes speed, not result, so it is left out)
+def cache_key(dataset, target, engine, params):
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(dataset, index=False).values.tobytes())
+    settings = {
+        'columns': [str(col) for col in dataset.columns],
+        'dtypes': [str(dtype) for dtype in dataset.dtypes],
+        'target': target,
+        'engine': engine,
+        'params': {**SETUP_PARAMS, **{name: value for name, value in params.items() if name != 'n_jobs'}},
+    }
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()
+
+def _result_files(folder):
+    return [path for pattern in RESULT_FILES for path in Path(folder).glob(pattern)]
+
+# Function to copy file cheaply (hard link when cache and jobs share one disk)
+def _copy(source, destination):
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+# Function to copy cached results into folder - returns False on miss
+def fetch(key, destination):
+    entry = CACHE_DIR / key
+    with _connect() as conn:
+        found = conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        if not found or not entry.is_dir():
+            return False
+        conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+    for path in _result_files(entry):
+        _copy(path, Path(destination) / path.name)
+    return True
+
+# Function to save results of finished training into cache
+def store(key, source):
+    entry = CACHE_DIR / key
+    tmp = CACHE_DIR / f'{key}.tmp{os.getpid()}'
+    tmp.mkdir(parents=True, exist_ok=True)
+    for path in _result_files(source):
+        _copy(path, tmp / path.name)
+    size = sum(path.stat().st_size for path in tmp.iterdir())
+    shutil.rmtree(entry, ignore_errors=True)
+    os.replace(tmp, entry)
+    with _connect() as conn:
+        conn.execute("INSERT OR REPLACE INTO entries (key, size, last_used) VALUES (?, ?, ?)", (key, size, time.time()))
+        _evict(conn)
+
+# Function to drop least recently used entries until cache fits in MAX_BYTES
+def _evict(conn):
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+    for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_used").fetchall():
+        if total <= MAX_BYTES:
+            break
+        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        shutil.rmtree(CACHE_DIR / key, ignore_errors=True)
+        total -= size
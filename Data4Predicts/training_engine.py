@@ -0,0 +1,185 @@
+#Imports
+
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+from sklearn.ensemble import AdaBoostClassifier, ExtraTreesClassifier, GradientBoostingClassifier, RandomForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression, RidgeClassifier, SGDClassifier
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+# Candidate models (names like in pycaret compare_models leaderboard)
+SESSION_ID = 123
+CANDIDATES = {
+    'Logistic Regression': (LogisticRegression, {'max_iter': 1000, 'random_state': SESSION_ID}),
+    'K Neighbors Classifier': (KNeighborsClassifier, {}),
+    'Naive Bayes': (GaussianNB, {}),
+    'Decision Tree Classifier': (DecisionTreeClassifier, {'random_state': SESSION_ID}),
+    'SVM - Linear Kernel': (SGDClassifier, {'random_state': SESSION_ID}),
+    'Ridge Classifier': (RidgeClassifier, {'random_state': SESSION_ID}),
+    'Random Forest Classifier': (RandomForestClassifier, {'n_jobs': 1, 'random_state': SESSION_ID}),
+    'Ada Boost Classifier': (AdaBoostClassifier, {'random_state': SESSION_ID}),
+    'Gradient Boosting Classifier': (GradientBoostingClassifier, {'random_state': SESSION_ID}),
+    'Linear Discriminant Analysis': (LinearDiscriminantAnalysis, {}),
+    'Extra Trees Classifier': (ExtraTreesClassifier, {'n_jobs': 1, 'random_state': SESSION_ID}),
+}
+
+# Function to parse numbers typed as text (form inputs are strings)
+def _to_numeric(X):
+    return pd.DataFrame(X).apply(pd.to_numeric, errors='coerce')
+
+# Function to build preprocessing + model pipeline for dataset columns
+def build_pipeline(name, X):
+    numeric = X.select_dtypes('number').columns.tolist()
+    categorical = [col for col in X.columns if col not in numeric]
+    preprocess = ColumnTransformer([
+        ('numeric', make_pipeline(FunctionTransformer(_to_numeric), SimpleImputer(), StandardScaler()), numeric),
+        ('categorical', make_pipeline(
+            SimpleImputer(strategy='most_frequent'),
+            OneHotEncoder(handle_unknown='infrequent_if_exist', max_categories=20, sparse_output=False),
+        ), categorical),
+    ])
+    estimator, params = CANDIDATES[name]
+    return Pipeline([('preprocess', preprocess), ('model', estimator(**params))])
+
+# Function to name model for "Select Your Champion" list
+def model_label(model):
+    if isinstance(model, Pipeline):
+        model = model.steps[-1][1]
+    return str(model).split('(')[0]
+
+# Function to tell search pipelines from pycaret models (they carry own preprocessing)
+def is_search_model(model):
+    return isinstance(model, Pipeline) and 'preprocess' in model.named_steps
+
+# Worker process state - dataset is sent once per worker, not once per task
+_X = None
+_y = None
+
+def _init_worker(X, y):
+    global _X, _y
+    _X, _y = X, y
+
+# Function to fit and score one candidate on one fold (runs in worker process)
+# (failing candidate is dropped from the race instead of stopping the search)
+def _evaluate(name, fold, train_index, test_index):
+    started = time.perf_counter()
+    pipeline = build_pipeline(name, _X)
+    try:
+        pipeline.fit(_X.iloc[train_index], _y.iloc[train_index])
+        y_true, y_pred = _y.iloc[test_index], pipeline.predict(_X.iloc[test_index])
+    except Exception:
+        return name, fold, None
+    return name, fold, {
+        'Accuracy': accuracy_score(y_true, y_pred),
+        'Recall': recall_score(y_true, y_pred, average='weighted', zero_division=0),
+        'Prec.': precision_score(y_true, y_pred, average='weighted', zero_division=0),
+        'F1': f1_score(y_true, y_pred, average='weighted', zero_division=0),
+        'TT (Sec)': time.perf_counter() - started,
+    }
+
+# Function to fit final model on whole dataset (runs in worker process)
+def _fit_full(name):
+    return build_pipeline(name, _X).fit(_X, _y)
+
+# Function to build leaderboard from fold scores collected so far
+def _leaderboard(scores, alive):
+    rows = []
+    for name, folds in scores.items():
+        if folds:
+            row = pd.DataFrame(folds.values()).mean().to_dict()
+            rows.append({'Model': name, **row, 'Folds': len(folds), 'Status': 'active' if name in alive else 'stopped'})
+    if not rows:
+        return pd.DataFrame(columns=['Model', 'Accuracy', 'Recall', 'Prec.', 'F1', 'TT (Sec)', 'Folds', 'Status'])
+    board = pd.DataFrame(rows).sort_values(['Folds', 'Accuracy'], ascending=False, ignore_index=True)
+    return board.round(4)
+
+# Function to start pool - returns (executor, child processes running before it), so pool workers
+# (started on demand) are the children that are not in that set
+def _pool(n_jobs, X, y):
+    others = set(multiprocessing.active_children())
+    context = multiprocessing.get_context('spawn')
+    executor = ProcessPoolExecutor(max_workers=n_jobs, mp_context=context, initializer=_init_worker, initargs=(X, y))
+    return executor, others
+
+# Function to stop pool at once - candidates still running after time budget are killed
+def _kill_pool(executor, others):
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in multiprocessing.active_children():
+        if process not in others:
+            process.terminate()
+
+# Model search - successive halving over CV folds in a process pool
+# Every rung evaluates one more fold for survivors (trained on eta times more rows than
+# previous rung, starting from min_rows), then keeps the best 1/eta of them.
+# Yields progress events: {'leaderboard', 'completed', 'total', 'models' (only in last event)}
+def search_models(dataset, target, n_select=5, folds=5, eta=2, min_rows=5000, time_budget=None, n_jobs=None, candidates=None):
+    X = dataset.drop(columns=[target])
+    y = dataset[target].astype(str)
+    names = list(candidates or CANDIDATES)
+    n_select = min(n_select, len(names))
+    folds = max(2, min(folds, y.value_counts().min()))
+    splits = list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=SESSION_ID).split(X, y))
+    rng = np.random.default_rng(SESSION_ID)
+    deadline = time.monotonic() + time_budget if time_budget else None
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    scores = {name: {} for name in names}
+    alive = list(names)
+    completed = 0
+    total = len(names)
+    out_of_time = False
+    executor, others = _pool(n_jobs, X, y)
+
+    try:
+        for fold, (train_index, test_index) in enumerate(splits):
+            train_index = rng.permutation(train_index)[:min_rows * eta ** fold]
+            pending = {executor.submit(_evaluate, name, fold, train_index, test_index) for name in alive}
+            while pending:
+                timeout = max(0.0, deadline - time.monotonic()) if deadline else None
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    # out of time - candidates still running this rung are dropped
+                    break
+                for future in done:
+                    name, fold_done, result = future.result()
+                    completed += 1
+                    if result is not None:
+                        scores[name][fold_done] = result
+                    yield {'leaderboard': _leaderboard(scores, alive), 'completed': completed, 'total': total, 'models': None}
+
+            # keep candidates that finished this rung, ranked by mean accuracy so far
+            ranked = sorted(
+                (name for name in alive if fold in scores[name]),
+                key=lambda name: np.mean([s['Accuracy'] for s in scores[name].values()]),
+                reverse=True,
+            )
+            alive = ranked[:max(n_select, math.ceil(len(ranked) / eta))]
+            out_of_time = deadline is not None and time.monotonic() >= deadline
+            if out_of_time or fold == len(splits) - 1 or not alive:
+                break
+            total = completed + len(alive)
+
+        # final fit of winners on whole dataset (in fresh pool when out of time)
+        board = _leaderboard(scores, alive)
+        best = board['Model'].head(n_select).tolist()
+        if out_of_time:
+            _kill_pool(executor, others)
+            executor, others = _pool(min(n_jobs, max(1, len(best))), X, y)
+        models = list(executor.map(_fit_full, best))
+    finally:
+        # also when search is stopped early (generator closed, error) - queued candidates are cancelled
+        executor.shutdown(wait=False, cancel_futures=True)
+    yield {'leaderboard': board, 'completed': completed, 'total': completed, 'models': models}
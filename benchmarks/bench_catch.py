@@ -0,0 +1,49 @@
+#Imports
+
+import asyncio
+import sqlite3
+import instructor
+import pandas as pd
+from openai import AsyncOpenAI
+import enrichment
+from invoice_extraction import extract_directory
+
+# Data4Catch - enrichment of extracted invoices (notebook merges vs indexed lookups) and extraction (mocked API)
+
+def _notebook_merge(folder, invoices):
+    with sqlite3.connect(folder / 'zad_domowe__clients.db') as conn:
+        clients_df = pd.read_sql_query("SELECT * FROM clients", conn)
+    products_df = pd.read_csv(folder / 'zad_domowe__products.csv', sep=None, engine='python')
+    orders_df = pd.DataFrame([
+        {**invoice.model_dump(exclude={'items'}), **item.model_dump()} for invoice in invoices for item in invoice.items
+    ])
+    merged_df = orders_df.merge(clients_df, left_on='customer_id', right_on='id', how='left', suffixes=('', '_client'))
+    return merged_df.merge(products_df, left_on='product_id', right_on='id', how='left', suffixes=('', '_product'))
+
+def bench_enrichment_notebook_merge(benchmark, catch_data):
+    folder, invoices = catch_data
+    merged = benchmark.pedantic(_notebook_merge, args=(folder, invoices), rounds=3)
+    assert len(merged) == 800
+
+def bench_enrichment_indexed(benchmark, catch_data):
+    folder, invoices = catch_data
+    conn = enrichment.connect(folder / 'zad_domowe__clients.db')
+    enrichment.ingest_products(conn, folder / 'zad_domowe__products.csv')
+    enrichment.ensure_indexes(conn)
+    rows = benchmark(enrichment.enrich_invoices, conn, invoices)
+    conn.close()
+    assert len(rows) == 800
+
+def bench_extract_directory(benchmark, mock_http, tmp_path):
+    for i in range(20):
+        (tmp_path / f'zad_domowe__invoice{i:02d}.png').write_bytes(bytes([i]) * 50_000)
+    client = instructor.from_openai(AsyncOpenAI(api_key='bench-key', base_url='https://mock.local/v1',
+                                                http_client=mock_http, max_retries=0))
+    rounds = iter(range(1_000))
+
+    def extract():
+        # fresh progress file every round - nothing is skipped
+        return asyncio.run(extract_directory(client, tmp_path, progress_path=tmp_path / f'progress{next(rounds)}.jsonl'))
+
+    invoices, report = benchmark.pedantic(extract, rounds=5)
+    assert report['extracted'] == 20 and report['failed'] == 0
@@ -0,0 +1,55 @@
+#Imports
+
+import pytest
+import ai_client
+import pdf_render
+import response_cache
+
+# Data4Creat - privacy policy PDF rendering and OpenAI calls (mocked, so only client overhead is measured)
+SECTION = ("Administratorem danych osobowych użytkowników aplikacji jest właściciel serwisu. Dane są "
+           "przetwarzane zgodnie z RODO, w celu świadczenia usług i obsługi zgłoszeń; użytkownik może żądać "
+           "ich sprostowania lub usunięcia. ") * 6
+
+def _document(sections):
+    return '\n\n'.join(f"## §{i + 1}. Postanowienia\n{SECTION}" for i in range(sections))
+
+@pytest.mark.parametrize('sections', [10, 100])
+def bench_save_pdf(benchmark, sections):
+    document = _document(sections)
+    # cache cleared before every round - measures rendering, not lookup
+    data = benchmark.pedantic(pdf_render.render, args=(document,), setup=pdf_render.render.cache_clear, rounds=5)
+    assert data.startswith(b'%PDF')
+
+def bench_save_pdf_cached(benchmark):
+    document = _document(100)
+    pdf_render.render(document)
+    benchmark(pdf_render.render, document)
+
+@pytest.fixture
+def openai_client(mock_http, tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(response_cache, 'DB_PATH', tmp_path / 'responses.db')
+    monkeypatch.setattr(ai_client, '_http', mock_http)
+    return ai_client.get_client('bench-key', 'https://mock.local/v1')
+
+def bench_generate_all(benchmark, openai_client):
+    def generate():
+        return ai_client.run(ai_client.generate_all(openai_client, 'Aplikacja do notatek', 'notatki', 'Jak dodać notatkę?',
+                                                    cache=False))
+    logo, privacy_policy, story = benchmark(generate)
+    assert logo.startswith(b'\x89PNG') and privacy_policy and story['content']
+
+def bench_generate_all_cached(benchmark, openai_client):
+    def generate():
+        return ai_client.run(ai_client.generate_all(openai_client, 'Aplikacja do notatek', 'notatki', 'Jak dodać notatkę?'))
+    generate()
+    logo, privacy_policy, story = benchmark(generate)
+    assert story.get('cached')
+
+def bench_stream_story(benchmark, openai_client):
+    def stream():
+        story = {}
+        tokens = list(ai_client.iterate(ai_client.stream_story(openai_client, 'notatki', 'Jak dodać notatkę?', story, cache=False)))
+        return tokens, story
+    tokens, story = benchmark(stream)
+    assert len(tokens) > 1 and story['usage']['total_tokens'] == 300
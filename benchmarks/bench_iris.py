@@ -0,0 +1,63 @@
+#Imports
+
+import numpy as np
+import pandas as pd
+import pytest
+from batch_scoring import FEATURES, classify_measurements, predict_labels
+from chart_cache import boxplot_specs, histogram_specs, render_chart, scatter_specs
+from compiled_predictor import compile_pipeline
+from conftest import IRIS_COLUMNS, IRIS_CSV
+from streaming_stats import stats_from_csv
+
+# Data4Iris - classify_iris latency, batch scoring and Data analysis charts
+
+FORM_INPUT = {'sepal_length': 5.1, 'sepal_width': 3.5, 'petal_length': 1.4, 'petal_width': 0.2}
+
+def bench_classify_single(benchmark, iris_pipeline):
+    # classify_iris without inference service - local classification of one form input
+    result = benchmark(classify_measurements, iris_pipeline, FORM_INPUT)
+    assert result['prediction_label'][0] == 'Iris-setosa'
+
+@pytest.mark.parametrize('rows', [1_000, 100_000])
+def bench_classify_batch(benchmark, iris_pipeline, rows):
+    X = np.random.default_rng(123).uniform(0.1, 8.0, size=(rows, len(FEATURES)))
+    labels = benchmark(predict_labels, iris_pipeline, X)
+    assert len(labels) == rows
+
+def bench_classify_single_compiled(benchmark, iris_pipeline):
+    # NumPy-only predictor exported from the same pipeline
+    predictor = compile_pipeline(iris_pipeline)
+    result = benchmark(classify_measurements, predictor, FORM_INPUT)
+    assert result['prediction_label'][0] == 'Iris-setosa'
+
+def bench_stats_from_csv(benchmark):
+    stats = benchmark(stats_from_csv, str(IRIS_CSV), IRIS_COLUMNS)
+    assert stats.count == 150
+
+def bench_stats_match_pandas(benchmark):
+    # small chunks - merging of moments, value counts and sketches across chunks is checked too
+    stats = benchmark(stats_from_csv, str(IRIS_CSV), IRIS_COLUMNS, chunk_size=40)
+    df = pd.read_csv(IRIS_CSV, header=0, names=IRIS_COLUMNS)
+    features, target = IRIS_COLUMNS[:-1], IRIS_COLUMNS[-1]
+    np.testing.assert_allclose(stats.mean, df[features].mean(), rtol=1e-12)
+    np.testing.assert_allclose(stats.variance(), df[features].var(), rtol=1e-12)
+    np.testing.assert_allclose(stats.correlation(), df[features].corr(), rtol=1e-12)
+    assert stats.class_counts == df[target].value_counts().to_dict()
+    for col in features:
+        # histograms are exact
+        counts, edges = stats.histogram(col, bins=20)
+        expected_counts, expected_edges = np.histogram(df[col], bins=20)
+        np.testing.assert_array_equal(counts, expected_counts)
+        np.testing.assert_array_equal(edges, expected_edges)
+        # quartiles come from t-digest sketches - approximate, within half of measurement step (0.1 cm)
+        for label, group in df.groupby(target):
+            for q in (0.25, 0.5, 0.75):
+                assert abs(stats.sketches[(label, col)].quantile(q) - group[col].quantile(q)) <= 0.05
+
+CHARTS = (histogram_specs(['długość płatka']) + scatter_specs([('długość płatka', 'szerokość płatka')])
+          + boxplot_specs(['długość kielicha']))
+
+@pytest.mark.parametrize('spec', CHARTS, ids=[spec[0] for spec in CHARTS])
+def bench_render_chart(benchmark, iris_stats, spec):
+    image = benchmark(render_chart, iris_stats, spec)
+    assert image[:4] == b'\x89PNG'
@@ -0,0 +1,42 @@
+#Imports
+
+import pandas as pd
+import pytest
+import job_queue
+from conftest import IRIS_COLUMNS, IRIS_CSV
+from fake_data import generate_fake_data, generate_fake_data_fast
+from training_engine import search_models
+
+# Data4Predicts - fake dataset generation and model training
+
+@pytest.mark.parametrize('rows', [1_000, 100_000, 1_000_000])
+def bench_generate_fake_data(benchmark, rows):
+    # 1M rows takes seconds - single round is enough to catch regressions
+    df = benchmark.pedantic(generate_fake_data_fast, args=('Salary', rows), kwargs={'seed': 123}, rounds=1 if rows >= 1_000_000 else 3)
+    assert len(df) == rows
+
+def bench_generate_fake_data_reference(benchmark):
+    # row-by-row Faker version kept as reference (about 0.5 ms per row, so only 1k rows)
+    df = benchmark.pedantic(generate_fake_data, args=('Salary', 1_000), rounds=1)
+    assert len(df) == 1_000
+
+def _train(dataset):
+    # 'Parallel search' engine of train_models - job worker runs the same search; here it is called directly
+    for event in search_models(dataset, 'klasa', n_select=3, folds=3, min_rows=50, n_jobs=1):
+        pass
+    return event
+
+def bench_train_models_search(benchmark):
+    dataset = pd.read_csv(IRIS_CSV, names=IRIS_COLUMNS, header=0)
+    event = benchmark.pedantic(_train, args=(dataset,), rounds=1)
+    assert len(event['models']) == 3
+
+def bench_train_models_pycaret(benchmark, tmp_path, monkeypatch):
+    # default 'PyCaret compare_models' engine - training part of job worker (setup, compare_models, saving)
+    monkeypatch.setattr(job_queue, 'JOBS_DIR', tmp_path)
+    # _train_pycaret points pycaret log into job directory via environment - restored after benchmark
+    monkeypatch.setenv('PYCARET_CUSTOM_LOGGING_PATH', str(tmp_path / 'bench' / 'pycaret.log'))
+    (tmp_path / 'bench').mkdir()
+    dataset = pd.read_csv(IRIS_CSV, names=IRIS_COLUMNS, header=0)
+    benchmark.pedantic(job_queue._train_pycaret, args=('bench', dataset, 'klasa', {'n_select': 3}), rounds=1)
+    assert len(list((tmp_path / 'bench').glob('model_*.pkl'))) == 3
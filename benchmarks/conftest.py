@@ -0,0 +1,89 @@
+#Imports
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+# Apps are plain script folders - their modules are imported like the apps import them
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIRS = ['1Data4Iris', 'Data4Predicts', 'Data4Creat', 'Data4Catch']
+for app_dir in APP_DIRS:
+    sys.path.insert(0, str(ROOT / app_dir))
+sys.path.insert(0, str(ROOT / 'instrumentation'))
+
+IRIS_CSV = ROOT / '1Data4Iris' / '25__iris.csv'
+IRIS_COLUMNS = ['długość kielicha', 'szerokość kielicha', 'długość płatka', 'szerokość płatka', 'klasa']
+LOGO_PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 2048
+
+# Function to answer OpenAI requests offline (chat, streamed chat, images, image download, invoice tool calls)
+def openai_handler(request):
+    path = request.url.path
+    if path.endswith('/images/generations'):
+        return httpx.Response(200, json={'created': 0, 'data': [{'url': 'https://mock.local/logo.png'}]})
+    if path.endswith('/logo.png'):
+        return httpx.Response(200, content=LOGO_PNG, headers={'Content-Type': 'image/png'})
+    body = json.loads(request.content)
+    if body.get('tools'):
+        # instructor structured output - InvoiceInfo as tool call
+        from stub_server import fake_invoice
+        message = {'role': 'assistant', 'content': None, 'tool_calls': [{
+            'id': 'call_mock', 'type': 'function',
+            'function': {'name': 'InvoiceInfo', 'arguments': json.dumps(fake_invoice(request.content[-4096:]))},
+        }]}
+    else:
+        message = {'role': 'assistant', 'content': 'Odpowiedź testowa. ' * 50}
+    usage = {'prompt_tokens': 100, 'completion_tokens': 200, 'total_tokens': 300}
+    if body.get('stream'):
+        words = message['content'].split(' ')
+        chunks = [{'id': 'mock', 'object': 'chat.completion.chunk', 'created': 0, 'model': body['model'],
+                   'choices': [{'index': 0, 'delta': {'content': word + ' '}, 'finish_reason': None}]} for word in words]
+        chunks.append({'id': 'mock', 'object': 'chat.completion.chunk', 'created': 0, 'model': body['model'],
+                       'choices': [], 'usage': usage})
+        data = ''.join(f'data: {json.dumps(chunk)}\n\n' for chunk in chunks) + 'data: [DONE]\n\n'
+        return httpx.Response(200, content=data.encode('utf-8'), headers={'Content-Type': 'text/event-stream'})
+    return httpx.Response(200, json={
+        'id': 'mock', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+        'choices': [{'index': 0, 'message': message, 'finish_reason': 'stop'}], 'usage': usage,
+    })
+
+@pytest.fixture(scope='session')
+def mock_http():
+    return httpx.AsyncClient(transport=httpx.MockTransport(openai_handler))
+
+@pytest.fixture(scope='session')
+def iris_pipeline():
+    from model_registry import load_pipeline
+    return load_pipeline()
+
+@pytest.fixture(scope='session')
+def iris_stats():
+    from streaming_stats import stats_from_csv
+    return stats_from_csv(str(IRIS_CSV), IRIS_COLUMNS)
+
+# Clients database and products CSV like in Data4Catch, with invoices to enrich
+@pytest.fixture(scope='session')
+def catch_data(tmp_path_factory):
+    from invoice_extraction import InvoiceInfo
+    folder = tmp_path_factory.mktemp('catch')
+    rng = np.random.default_rng(123)
+    clients, products = 100_000, 20_000
+    with sqlite3.connect(folder / 'zad_domowe__clients.db') as conn:
+        pd.DataFrame({
+            'id': np.arange(1, clients + 1), 'name': [f'Klient {i}' for i in range(1, clients + 1)],
+            'email': 'klient@example.pl', 'phone': '500600700',
+        }).to_sql('clients', conn, index=False)
+    pd.DataFrame({'id': np.arange(1, products + 1), 'name': [f'Produkt {i}' for i in range(1, products + 1)]}) \
+        .to_csv(folder / 'zad_domowe__products.csv', sep=';', index=False)
+    invoices = [
+        InvoiceInfo(company_name='Firma', customer_id=int(rng.integers(1, clients)), customer_name='x',
+                    invoice_number=i, date='2024-05-01',
+                    items=[{'description': 'd', 'product_id': int(product), 'quantity': 1, 'price': 9.99}
+                           for product in rng.integers(1, products, 4)])
+        for i in range(200)
+    ]
+    return folder, invoices
@@ -0,0 +1,80 @@
+#Imports
+
+import argparse
+import asyncio
+import socket
+import threading
+import time
+import httpx
+import numpy as np
+import uvicorn
+from server import InferenceService
+
+# Load test - concurrent single-row iris requests against service with and without micro-batching
+
+# Function to start service in background thread on free port - returns (server, url)
+def start(service):
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(service, host='127.0.0.1', port=port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f'http://127.0.0.1:{port}'
+
+# Function to send requests from concurrent clients - returns client side latencies and service metrics
+async def run_clients(url, clients, requests_per_client, seed=123):
+    rows = np.random.default_rng(seed).uniform(0.1, 8.0, size=(clients * requests_per_client, 4)).round(1)
+    features = ['sepal_length', 'sepal_width', 'petal_length', 'petal_width']
+    latencies = []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        async def worker(offset):
+            for row in rows[offset::clients]:
+                started = time.perf_counter()
+                response = await client.post('/predict/iris', json={'rows': [dict(zip(features, row.tolist()))]})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+        seconds = time.perf_counter() - started
+        metrics = (await client.get('/metrics')).json()['models']['iris']
+    latencies = np.asarray(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'requests_per_sec': len(latencies) / seconds,
+        'client_p50_ms': float(np.percentile(latencies, 50)),
+        'client_p99_ms': float(np.percentile(latencies, 99)),
+        'service_p50_ms': metrics['p50_ms'],
+        'service_p99_ms': metrics['p99_ms'],
+        'mean_batch_size': metrics['mean_batch_size'],
+        'max_batch_size': metrics['max_batch_size'],
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load test of inference service: micro-batching off vs on.")
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=50, help="requests per client")
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-wait-ms', type=float, default=5)
+    parser.add_argument('--pipeline', action='store_true', help="host pycaret pipeline instead of compiled predictor")
+    args = parser.parse_args()
+
+    iris_loader = None
+    if args.pipeline:
+        from batch_scoring import predict_labels
+        from model_registry import load_pipeline
+
+        def iris_loader():
+            model = load_pipeline()
+            return lambda rows: np.asarray(predict_labels(model, np.asarray(rows, dtype=np.float64))).tolist()
+
+    for name, max_batch, max_wait_ms in [('no batching', 1, 0), ('micro-batching', args.max_batch, args.max_wait_ms)]:
+        service = InferenceService(max_batch, max_wait_ms, **({'iris_loader': iris_loader} if iris_loader else {}))
+        server, url = start(service)
+        result = asyncio.run(run_clients(url, args.clients, args.requests))
+        server.should_exit = True
+        print(f"{name} (max_batch={max_batch}, max_wait_ms={max_wait_ms}): "
+              + ', '.join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}" for key, value in result.items()))
@@ -0,0 +1,131 @@
+#Imports
+
+import asyncio
+import os
+import time
+from collections import Counter, deque
+import numpy as np
+
+# Micro-batching - single-row requests for one model wait at most MAX_WAIT_MS and are scored together
+# (up to MAX_BATCH rows per model call), one batch per model at a time
+MAX_BATCH = int(os.environ.get('INFERENCE_MAX_BATCH', 64))
+MAX_WAIT_MS = float(os.environ.get('INFERENCE_MAX_WAIT_MS', 5))
+WINDOW = 10_000
+
+# Latency and batch size of last WINDOW requests / batches
+class Metrics:
+    def __init__(self, window=WINDOW):
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window)
+        self.batch_sizes = deque(maxlen=window)
+
+    def record_batch(self, size, failed=False):
+        self.batches += 1
+        self.errors += size if failed else 0
+        self.batch_sizes.append(size)
+
+    def record_request(self, seconds):
+        self.requests += 1
+        self.latencies.append(seconds)
+
+    def snapshot(self):
+        latencies = np.asarray(self.latencies) * 1000
+        sizes = np.asarray(self.batch_sizes)
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'errors': self.errors,
+            'p50_ms': float(np.percentile(latencies, 50)) if len(latencies) else None,
+            'p99_ms': float(np.percentile(latencies, 99)) if len(latencies) else None,
+            'mean_batch_size': float(sizes.mean()) if len(sizes) else None,
+            'max_batch_size': int(sizes.max()) if len(sizes) else None,
+            'batch_size_histogram': {str(size): count for size, count in sorted(Counter(sizes.tolist()).items())},
+        }
+
+class MicroBatcher:
+    # predict - function of list of rows returning one label per row (runs in worker thread)
+    def __init__(self, predict, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.predict = predict
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = Metrics()
+        self._queue = None
+        self._task = None
+
+    # Function to score one row - waits for the batch it ends up in
+    async def submit(self, row):
+        if self._queue is None:
+            # queue and worker belong to the running event loop, created on first request
+            self._queue = asyncio.Queue()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        try:
+            return await future
+        finally:
+            self.metrics.record_request(time.perf_counter() - started)
+
+    # Function to collect next batch - first row, then whatever arrives until window closes or batch is full
+    # (None in queue is close() request - rows queued before it are still scored)
+    async def _collect(self):
+        item = await self._queue.get()
+        if item is None:
+            return [], True
+        items = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(items) < self.max_batch:
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            if item is None:
+                return items, True
+            items.append(item)
+        return items, False
+
+    async def _run(self):
+        closing = False
+        while not closing:
+            items, closing = await self._collect()
+            if items:
+                await self._score(items)
+
+    async def _score(self, items):
+        rows = [row for row, future in items]
+        try:
+            labels = await asyncio.to_thread(self.predict, rows)
+        except Exception as e:
+            if len(items) > 1:
+                # failed batch - rows scored again one by one, so only requests with bad rows get the error
+                for item in items:
+                    await self._score([item])
+                return
+            self.metrics.record_batch(1, failed=True)
+            row, future = items[0]
+            if not future.done():
+                future.set_exception(e)
+            return
+        self.metrics.record_batch(len(items))
+        for (row, future), label in zip(items, labels):
+            if not future.done():
+                future.set_result(label)
+
+    # Function to stop worker once queued rows are scored (next submit starts it again)
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            await self._queue.put(None)
+            await self._task
+            if not self._queue.empty():
+                # rows submitted while closing
+                self._task = asyncio.create_task(self._run())
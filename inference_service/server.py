@@ -0,0 +1,192 @@
+#Imports
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+
+# Apps are plain script folders - their modules are imported like the apps import them
+ROOT = Path(__file__).resolve().parent.parent
+for app_dir in ['1Data4Iris', 'Data4Predicts']:
+    sys.path.insert(0, str(ROOT / app_dir))
+
+from micro_batcher import MAX_BATCH, MAX_WAIT_MS, MicroBatcher
+
+# Inference service - models hosted once per process, concurrent single-row requests coalesced into micro-batches
+#   POST /predict/iris                    {"rows": [{"sepal_length": 5.1, ...}]} -> {"labels": [...]}
+#   POST /predict/job/<job_id>/<index>    {"rows": [{column: value}]}  (Data4Predicts model of finished job)
+#   GET  /metrics                         p50 / p99 latency and batch sizes per model
+#   GET  /health
+MAX_MODELS = int(os.environ.get('INFERENCE_MAX_MODELS', 8))
+MAX_BODY_BYTES = 1024 * 1024
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# Function to load iris model - compiled predictor when exported, pipeline otherwise
+def load_iris():
+    from batch_scoring import predict_labels
+    from model_registry import load_predictor
+    model = load_predictor()
+
+    def predict(rows):
+        return np.asarray(predict_labels(model, np.asarray(rows, dtype=np.float64))).tolist()
+    return predict
+
+# Function to turn iris request row into feature vector (checked before queueing, so bad row fails only its request)
+def parse_iris_row(row):
+    from batch_scoring import FEATURES
+    try:
+        return [float(row[feature]) for feature in FEATURES]
+    except (KeyError, TypeError, ValueError):
+        raise HTTPError(400, f"Each row needs numeric {', '.join(FEATURES)}.")
+
+# Function to load model trained by Data4Predicts job (row values are cast to training schema like in the app)
+def load_job_model(job_id, index):
+    import joblib
+    import pandas as pd
+    from bulk_predict import coerce_to_schema, predict_labels, training_schema
+    from job_queue import get_job, job_dir, load_inputs
+
+    job = get_job(job_id)
+    path = job_dir(job_id) / f'model_{index}.pkl' if job is not None else None
+    if job is None or job['status'] != 'done' or not path.exists():
+        raise HTTPError(404, f"No trained model {index} for job {job_id}.")
+    model = joblib.load(path)
+    dataset, target = load_inputs(job_id)
+    schema = training_schema(dataset, target)
+
+    def predict(rows):
+        return np.asarray(predict_labels(model, coerce_to_schema(pd.DataFrame(rows), schema))).tolist()
+    return predict
+
+def parse_job_row(row):
+    if not isinstance(row, dict):
+        raise HTTPError(400, "Each row must be an object of column values.")
+    return row
+
+class InferenceService:
+    def __init__(self, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, iris_loader=load_iris, max_models=MAX_MODELS):
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self.iris_loader = iris_loader
+        self.max_models = max_models
+        self._batchers = OrderedDict()
+        self._loading = {}
+        self._metrics = {}
+
+    # ASGI entry point
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            try:
+                status, payload = await self._route(scope['method'], scope['path'], receive)
+            except HTTPError as e:
+                status, payload = e.status, {'error': str(e)}
+            except Exception as e:
+                status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+            body = json.dumps(payload, default=str).encode('utf-8')
+            await send({'type': 'http.response.start', 'status': status,
+                        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]})
+            await send({'type': 'http.response.body', 'body': body})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # warm start - iris model is loaded before first request
+                await self._batcher('iris', self.iris_loader)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                for batcher in self._batchers.values():
+                    await batcher.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _route(self, method, path, receive):
+        parts = [part for part in path.split('/') if part]
+        if method == 'GET' and parts == ['health']:
+            return 200, {'status': 'ok', 'models': list(self._batchers)}
+        if method == 'GET' and parts == ['metrics']:
+            return 200, self.metrics()
+        if method == 'POST' and parts == ['predict', 'iris']:
+            return 200, await self._predict('iris', self.iris_loader, parse_iris_row, receive)
+        if method == 'POST' and len(parts) == 4 and parts[:2] == ['predict', 'job'] and parts[3].isdigit():
+            job_id, index = parts[2], int(parts[3])
+            return 200, await self._predict(f'job/{job_id}/{index}', lambda: load_job_model(job_id, index),
+                                            parse_job_row, receive)
+        raise HTTPError(404, f"Unknown endpoint {method} {path}.")
+
+    async def _predict(self, key, loader, parse_row, receive):
+        body = await _read_body(receive)
+        try:
+            rows = json.loads(body)['rows']
+        except (ValueError, KeyError, TypeError):
+            raise HTTPError(400, 'Body must be JSON object with "rows" list.')
+        if not isinstance(rows, list) or not rows:
+            raise HTTPError(400, '"rows" must be non-empty list.')
+        rows = [parse_row(row) for row in rows]
+        batcher = await self._batcher(key, loader)
+        labels = await asyncio.gather(*(batcher.submit(row) for row in rows))
+        return {'labels': labels}
+
+    # Function to get batcher of model - model loaded once (in worker thread), least recently used dropped
+    # when more than max_models are hosted
+    async def _batcher(self, key, loader):
+        if key in self._batchers:
+            self._batchers.move_to_end(key)
+            return self._batchers[key]
+        if key not in self._loading:
+            self._loading[key] = asyncio.ensure_future(asyncio.to_thread(loader))
+        try:
+            predict = await self._loading[key]
+        finally:
+            self._loading.pop(key, None)
+        if key not in self._batchers:
+            batcher = MicroBatcher(predict, self.max_batch, self.max_wait_ms)
+            # counters survive eviction - reloaded model continues its metrics
+            batcher.metrics = self._metrics.setdefault(key, batcher.metrics)
+            self._batchers[key] = batcher
+            while len(self._batchers) > self.max_models:
+                evicted_key, evicted = self._batchers.popitem(last=False)
+                await evicted.close()
+        return self._batchers[key]
+
+    def metrics(self):
+        return {
+            'max_batch': self.max_batch,
+            'max_wait_ms': self.max_wait_ms,
+            'models': {key: metrics.snapshot() for key, metrics in self._metrics.items()},
+        }
+
+# Function to read request body (limited to MAX_BODY_BYTES)
+async def _read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large.")
+        if not message.get('more_body'):
+            return body
+
+app = InferenceService()
+
+# Run: python inference_service/server.py (or uvicorn server:app --app-dir inference_service)
+if __name__ == '__main__':
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Micro-batching inference service for Data4Iris and Data4Predicts models.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH)
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+    uvicorn.run(InferenceService(args.max_batch, args.max_wait_ms), host=args.host, port=args.port, log_level='warning')
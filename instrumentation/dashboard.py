@@ -0,0 +1,58 @@
+#Imports
+
+import io
+import pstats
+import time
+import pandas as pd
+import streamlit as st
+import timings
+
+# Timings dashboard - slowest stages / reruns / external calls of all apps: streamlit run instrumentation/dashboard.py
+
+st.title("Rerun timings ⏱")
+
+hours = st.sidebar.number_input("Last hours", min_value=1, value=24)
+records = timings.load_records(since=time.time() - hours * 3600)
+if not records:
+    st.info(f"No timings in {timings.TIMINGS_DIR} yet - run any app (APP_TIMINGS=1) and come back.")
+    st.stop()
+
+apps = sorted({record['app'] for record in records})
+selected_apps = st.sidebar.multiselect("Apps", apps, default=apps)
+records = [record for record in records if record['app'] in selected_apps]
+frame = timings.stages_frame(records)
+
+# Slowest stages - p95 over all reruns in period
+st.subheader("Slowest stages 🐢")
+st.dataframe(timings.slowest_stages(frame).round(2), use_container_width=True)
+
+# Slowest reruns with stage breakdown
+st.subheader("Slowest reruns")
+reruns = pd.DataFrame([
+    {'app': record['app'], 'session': record['session'][:12], 'rerun': record['rerun'],
+     'time': pd.to_datetime(record['timestamp'], unit='s'), 'total_ms': record['total_ms'], 'complete': record['complete'],
+     'slowest stage': max(record['stages'], key=lambda stage: stage['ms'])['name'] if record['stages'] else None,
+     'profile': record['profile']}
+    for record in records
+]).sort_values('total_ms', ascending=False)
+st.dataframe(reruns.head(20), use_container_width=True)
+
+# External calls - API round trips with token usage
+calls = frame[frame['kind'] == 'call'] if not frame.empty else frame
+if not calls.empty:
+    st.subheader("External calls 🌐")
+    columns = [column for column in ['app', 'name', 'ms', 'model', 'cached', 'total_tokens', 'prompt_tokens',
+                                     'completion_tokens', 'time_to_first_token', 'error'] if column in calls.columns]
+    st.dataframe(calls.sort_values('timestamp', ascending=False)[columns].head(50), use_container_width=True)
+    if 'total_tokens' in calls.columns:
+        st.write(f"Tokens in period: **{int(calls['total_tokens'].fillna(0).sum()):,}**")
+
+# Profiles - captured for sessions with "Profile reruns" on
+profiles = sorted(timings.PROFILES_DIR.glob('*.prof'), key=lambda path: path.stat().st_mtime, reverse=True) if timings.PROFILES_DIR.exists() else []
+if profiles:
+    st.subheader("Profiles 🔬")
+    profile = st.selectbox("Profile", [path.name for path in profiles])
+    sort = st.radio("Sort by", ['cumulative', 'tottime', 'ncalls'], horizontal=True)
+    output = io.StringIO()
+    pstats.Stats(str(timings.PROFILES_DIR / profile), stream=output).strip_dirs().sort_stats(sort).print_stats(30)
+    st.code(output.getvalue())
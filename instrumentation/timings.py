@@ -0,0 +1,170 @@
+#Imports
+
+import contextvars
+import cProfile
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Rerun timings - every script rerun (or training job) is one record: named stages and external calls
+# with their durations, appended as JSON line to TIMINGS_DIR/<app>.jsonl; optional cProfile capture per rerun
+TIMINGS_DIR = Path(os.environ.get('APP_TIMINGS_DIR', Path(__file__).with_name('rerun_timings')))
+PROFILES_DIR = TIMINGS_DIR / 'profiles'
+ENABLED = os.environ.get('APP_TIMINGS', '1') != '0'
+MAX_FILE_BYTES = int(os.environ.get('APP_TIMINGS_MB', 16)) * 1024 * 1024
+
+# Current rerun - context variable, so it follows the script thread and async tasks started from it
+_current = contextvars.ContextVar('rerun', default=None)
+_open = {}
+_reruns = {}
+_lock = threading.Lock()
+
+class Rerun:
+    def __init__(self, app, session, number, profile=False):
+        self.app = app
+        self.session = session
+        self.number = number
+        self.timestamp = time.time()
+        self.started = time.perf_counter()
+        self.stages = []
+        self.profiler = cProfile.Profile() if profile else None
+
+    def add(self, name, kind, started, seconds, meta):
+        self.stages.append({
+            'name': name,
+            'kind': kind,
+            'start_ms': round((started - self.started) * 1000, 3),
+            'ms': round(seconds * 1000, 3),
+            **meta,
+        })
+
+# Function to start rerun of app session - unfinished previous rerun of the session (st.stop / st.rerun /
+# exception) is written first, marked complete=False
+def begin(app, session, profile=False):
+    if not ENABLED:
+        return None
+    with _lock:
+        previous = _open.pop((app, session), None)
+        number = _reruns[(app, session)] = _reruns.get((app, session), 0) + 1
+    if previous is not None:
+        _finish(previous, complete=False)
+    rerun = Rerun(app, session, number, profile)
+    with _lock:
+        _open[(app, session)] = rerun
+    _current.set(rerun)
+    if rerun.profiler is not None:
+        rerun.profiler.enable()
+    return rerun
+
+# Function to finish current rerun and write its record
+def end():
+    rerun = _current.get()
+    if rerun is None:
+        return None
+    _current.set(None)
+    with _lock:
+        if _open.get((rerun.app, rerun.session)) is rerun:
+            del _open[(rerun.app, rerun.session)]
+    return _finish(rerun, complete=True)
+
+def _finish(rerun, complete):
+    record = {
+        'app': rerun.app,
+        'session': rerun.session,
+        'rerun': rerun.number,
+        'timestamp': rerun.timestamp,
+        'total_ms': round((time.perf_counter() - rerun.started) * 1000, 3),
+        'complete': complete,
+        'stages': rerun.stages,
+        'profile': None,
+    }
+    if rerun.profiler is not None:
+        rerun.profiler.disable()
+        PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+        profile_path = PROFILES_DIR / f'{rerun.app}_{rerun.session[:12]}_{rerun.number}.prof'
+        rerun.profiler.dump_stats(profile_path)
+        record['profile'] = profile_path.name
+    _write(rerun.app, record)
+    return record
+
+# Function to append record to app file (file over MAX_FILE_BYTES is rotated to <app>.jsonl.1)
+def _write(app, record):
+    path = TIMINGS_DIR / f'{app}.jsonl'
+    line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+    with _lock:
+        TIMINGS_DIR.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size > MAX_FILE_BYTES:
+            os.replace(path, path.with_name(f'{path.name}.1'))
+        with open(path, 'a', encoding='utf-8') as file:
+            file.write(line)
+
+# Function to get current rerun (None outside instrumented rerun)
+def current():
+    return _current.get()
+
+# Function to make rerun current in other thread / event loop task (e.g. background asyncio loop)
+def attach(rerun):
+    _current.set(rerun)
+
+# Function to time named stage of current rerun - yields dict, keys added to it are saved with the stage
+# (rows, tokens, ...); does nothing outside instrumented rerun
+@contextmanager
+def stage(name, kind='stage', **meta):
+    rerun = _current.get()
+    started = time.perf_counter()
+    try:
+        yield meta
+    except BaseException as e:
+        meta['error'] = type(e).__name__
+        raise
+    finally:
+        if rerun is not None:
+            rerun.add(name, kind, started, time.perf_counter() - started, meta)
+
+# Function to time external call (API request, file write) - same as stage, kind='call'
+def call(name, **meta):
+    return stage(name, kind='call', **meta)
+
+# Function to add already measured call (e.g. streamed answer timed by its generator)
+def record_call(name, seconds, **meta):
+    rerun = _current.get()
+    if rerun is not None:
+        rerun.add(name, 'call', time.perf_counter() - seconds, seconds, meta)
+
+# Function to read records of all apps (newest files last), since - unix time
+def load_records(directory=TIMINGS_DIR, since=None):
+    records = []
+    for path in sorted(Path(directory).glob('*.jsonl*'), key=lambda path: path.stat().st_mtime):
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # line cut by crash while writing
+                    continue
+                if since is None or record['timestamp'] >= since:
+                    records.append(record)
+    return records
+
+# Function to flatten records into one row per stage (pandas DataFrame)
+def stages_frame(records):
+    import pandas as pd
+
+    rows = [
+        {'app': record['app'], 'session': record['session'], 'rerun': record['rerun'],
+         'timestamp': record['timestamp'], **stage}
+        for record in records for stage in record['stages']
+    ]
+    return pd.DataFrame(rows, columns=None if rows else ['app', 'session', 'rerun', 'timestamp', 'name', 'kind', 'start_ms', 'ms'])
+
+# Function to summarise stages - count, p50 / p95 / max ms and total seconds per app and stage, slowest first
+def slowest_stages(frame):
+    if frame.empty:
+        return frame
+    summary = frame.groupby(['app', 'kind', 'name'])['ms'].agg(
+        count='count', p50_ms='median', p95_ms=lambda ms: ms.quantile(0.95), max_ms='max', total_s=lambda ms: ms.sum() / 1000,
+    )
+    return summary.sort_values('p95_ms', ascending=False).reset_index()